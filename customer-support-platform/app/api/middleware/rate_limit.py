@@ -1,80 +1,104 @@
 """Rate limiting middleware using Redis."""
-from typing import Callable, Optional
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 from app.core.redis import get_redis
 
+# Paths that are never rate limited
+_SKIP = frozenset({"/health", "/healthcheck", "/metrics"})
+# Per-dependency probes such as /health/redis live under this prefix
+_SKIP_PREFIX = "/health/"
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limit requests based on client IP and endpoint."""
-    
-    def __init__(self, app):
-        super().__init__(app)
+# Static parts of the 429 response, built once at import time
+_TOO_MANY_REQUESTS_BODY = b'{"detail":"Too many requests","retry_after":%d}'
+_TOO_MANY_REQUESTS_HEADERS = [(b"content-type", b"application/json")]
+
+
+class RateLimitMiddleware:
+    """
+    Rate limit requests based on client IP and endpoint.
+
+    Implemented as a raw ASGI middleware so rejected requests are answered
+    before any ``Request`` object or ``BaseHTTPMiddleware`` stream wrapping
+    is set up, and accepted requests pass straight through to the app.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.redis = None
-        
+
     async def _get_redis(self):
         """Lazy load Redis connection."""
         if not self.redis:
             self.redis = await get_redis()
         return self.redis
 
-    async def _get_rate_limit(self, path: str) -> dict:
+    def _get_rate_limit(self, path: str) -> dict:
         """Get rate limit config for path."""
-        # Default rate limits
-        default = settings.RATE_LIMITS["default"]
-        
         # API endpoint specific limits
         if path.startswith("/api/"):
             return settings.RATE_LIMITS["api_endpoints"]
-            
+
         # Auth endpoints
         if path.startswith("/auth/"):
             return settings.RATE_LIMITS["auth"]
-            
-        return default
 
-    async def dispatch(
-        self, request: Request, call_next: Callable
-    ) -> Response:
-        if not settings.RATE_LIMIT_ENABLED:
-            return await call_next(request)
+        return settings.RATE_LIMITS["default"]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path in _SKIP or path.startswith(_SKIP_PREFIX):
+            await self.app(scope, receive, send)
+            return
 
         # Get client IP
-        client_ip = request.client.host
-        path = request.url.path
-        
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
         # Get rate limit config
-        limit_config = await self._get_rate_limit(path)
+        limit_config = self._get_rate_limit(path)
         max_requests = limit_config["requests"]
         window = limit_config["window_seconds"]
-        
+
         # Generate Redis key
         key = f"rate_limit:{client_ip}:{path}"
-        
+
         # Check rate limit
         redis = await self._get_redis()
         requests = await redis.incr(key)
-        
+
         # Set expiry on first request
         if requests == 1:
             await redis.expire(key, window)
-            
+
+        ttl = await redis.ttl(key)
+
         if requests > max_requests:
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "detail": "Too many requests",
-                    "retry_after": await redis.ttl(key)
-                }
-            )
-            
+            body = _TOO_MANY_REQUESTS_BODY % ttl
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": _TOO_MANY_REQUESTS_HEADERS + [
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
         # Add rate limit headers
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(max_requests)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, max_requests - requests))
-        response.headers["X-RateLimit-Reset"] = str(await redis.ttl(key))
-        
-        return response
\ No newline at end of file
+        rate_headers = [
+            (b"x-ratelimit-limit", str(max_requests).encode()),
+            (b"x-ratelimit-remaining", str(max(0, max_requests - requests)).encode()),
+            (b"x-ratelimit-reset", str(ttl).encode()),
+        ]
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + rate_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
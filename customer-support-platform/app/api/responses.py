@@ -0,0 +1,21 @@
+"""Shared HTTP response classes."""
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+
+from app.utils.formatters import format_json_bytes
+
+
+class JSONBytesResponse(ORJSONResponse):
+    """
+    Render responses with the app's single orjson encoder.
+
+    UUIDs and datetimes are encoded natively by orjson and Decimals by the
+    shared default hook, so schemas need no per-class json_encoders.
+    Content that is already serialized (e.g. from the cache) is sent as-is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return format_json_bytes(content)
@@ -1,5 +1,10 @@
+from datetime import date, datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.responses import JSONBytesResponse
+from app.core.database import async_session_factory, get_db
 from app.core.security import require_admin_or_analyst
 from app.schemas.analytics import (
     TicketSummary,
@@ -111,4 +116,60 @@ async def get_resolution_rates(
         end_date=end_date,
         category_id=category_id,
         agent_id=agent_id
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/organization/stats", response_class=JSONBytesResponse)
+async def get_organization_stats(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_admin_or_analyst)
+):
+    """Get combined statistics for the current organization"""
+    analytics_service = AnalyticsService(db)
+    payload = await analytics_service.get_organization_stats_json(
+        current_user.organization_id,
+        start_date=start_date,
+        end_date=end_date
+    )
+    return JSONBytesResponse(payload)
+
+
+@router.get("/trending", response_class=JSONBytesResponse)
+async def get_trending_issues(
+    days: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_admin_or_analyst)
+):
+    """Get trending issues from recent tickets"""
+    analytics_service = AnalyticsService(db)
+    payload = await analytics_service.get_trending_issues_json(
+        current_user.organization_id,
+        days=days
+    )
+    return JSONBytesResponse(payload)
+
+
+@router.get("/daily")
+async def stream_daily_metrics(
+    start_date: date,
+    end_date: date,
+    current_user=Depends(require_admin_or_analyst)
+):
+    """Stream daily analytics rows for the current organization"""
+    organization_id = current_user.organization_id
+
+    async def body():
+        # The response outlives request-scoped dependencies, so the stream
+        # holds its own session
+        async with async_session_factory() as db:
+            analytics_service = AnalyticsService(db)
+            async for chunk in analytics_service.stream_daily_metrics_json(
+                organization_id,
+                start_date,
+                end_date
+            ):
+                yield chunk
+
+    return StreamingResponse(body(), media_type="application/json")
@@ -79,7 +79,7 @@ class Settings(BaseSettings):
     
     @property
     def WORKERS_COUNT(self) -> int:
-        return int(self._get_secret("WORKERS_COUNT", 4))
+        return int(self._get_secret("WORKERS_COUNT", 2 * (os.cpu_count() or 1) + 1))
     
     @property
     def RELOAD(self) -> bool:
@@ -412,9 +412,9 @@ class Settings(BaseSettings):
     def POSTGRES_SSL(self) -> bool:
         return str(self._get_secret("POSTGRES_SSL", "False")).lower() in ("true", "1", "yes")
     
-    POSTGRES_POOL_SIZE: int = 20
-    POSTGRES_MAX_OVERFLOW: int = 10
-    POSTGRES_POOL_RECYCLE: int = 300
+    POSTGRES_POOL_SIZE: int = 25
+    POSTGRES_MAX_OVERFLOW: int = 25
+    POSTGRES_POOL_RECYCLE: int = 1800
     POSTGRES_POOL_TIMEOUT: int = 30
     POSTGRES_ECHO: bool = False
 
@@ -468,6 +468,12 @@ class Settings(BaseSettings):
     def KEYCLOAK_CALLBACK_URI(self) -> str:
         return self._get_secret("KEYCLOAK_CALLBACK_URI", "http://localhost:8000/auth/callback")
 
+    # Keycloak SDK calls allowed on the threadpool at once
+    KEYCLOAK_MAX_CONCURRENCY: int = 16
+    # Required "aud" of access tokens; Keycloak only sets the client here
+    # when an audience mapper is configured, so unset skips the check
+    KEYCLOAK_AUDIENCE: Optional[str] = None
+
     # Email Configuration
     @property
     def SMTP_HOST(self) -> str:
@@ -510,6 +516,11 @@ class Settings(BaseSettings):
     def TELEGRAM_POLLING_TIMEOUT(self) -> int:
         return int(self._get_secret("TELEGRAM_POLLING_TIMEOUT", 30))
 
+    # Which single process calls getUpdates: "beat" (the scheduled
+    # telegram.poll_updates task) or "worker" (python -m
+    # app.integrations.telegram_client). Telegram rejects concurrent pollers.
+    TELEGRAM_POLLER: str = "beat"
+
     # Razorpay Configuration
     @property
     def RAZORPAY_KEY_ID(self) -> str:
@@ -522,6 +533,9 @@ class Settings(BaseSettings):
     @property
     def RAZORPAY_TEST_MODE(self) -> bool:
         return str(self._get_secret("RAZORPAY_TEST_MODE", "True")).lower() in ("true", "1", "yes")
+
+    # Razorpay SDK calls allowed on the threadpool at once
+    RAZORPAY_MAX_CONCURRENCY: int = 16
     
     # Email Templates Configuration
     EMAIL_TEMPLATES_DIR: str = "app/templates/email"
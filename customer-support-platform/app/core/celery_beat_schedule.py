@@ -11,4 +11,12 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'app.tasks.telegram_tasks.poll_telegram_updates_task',
         'schedule': crontab(minute='*/2'),  # every 2 minutes
     },
+    'refresh-ticket-analytics-daily': {
+        'task': 'analytics.refresh_daily_view',
+        'schedule': crontab(minute=0),  # hourly
+    },
+    'recount-org-tickets': {
+        'task': 'analytics.recount_org_tickets',
+        'schedule': crontab(hour=3, minute=30),  # nightly
+    },
 }
@@ -1,12 +1,27 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import NullPool
 from typing import AsyncGenerator, Any
+import json
 import os
 
 from app.config import settings
 from app.models import *  # noqa: F401, F403
-from app.models.base import Base
+from app.models.base import Base, bootstrap_ddl
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+
+def _json_serializer(value: Any) -> str:
+    """Encode JSON/JSONB column values, with orjson when available."""
+    if orjson is None:
+        return json.dumps(value)
+    return orjson.dumps(value).decode()
+
 
 # Create async database engine
 engine = create_async_engine(
@@ -14,8 +29,12 @@ engine = create_async_engine(
     echo=settings.DEBUG,
     pool_pre_ping=True,
     poolclass=NullPool if settings.TESTING else None,
-    pool_size=20 if not settings.TESTING else 5,
-    max_overflow=10 if not settings.TESTING else 0,
+    pool_size=settings.POSTGRES_POOL_SIZE if not settings.TESTING else 5,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW if not settings.TESTING else 0,
+    pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+    pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads if orjson else json.loads,
 )
 
 # Create async session factory
@@ -26,6 +45,18 @@ async_session_factory = async_sessionmaker(
     autoflush=False,
 )
 
+# Advisory lock id serialising bootstrap DDL across workers starting together
+_BOOTSTRAP_LOCK_ID = 0x7469636B
+
+async def apply_bootstrap_ddl() -> None:
+    """Create or replace the triggers and views the models declare on an existing database."""
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:id)"), {"id": _BOOTSTRAP_LOCK_ID}
+        )
+        for ddl in bootstrap_ddl:
+            await conn.execute(ddl)
+
 # Dependency to get DB session
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that provides a database session."""
@@ -0,0 +1,18 @@
+"""Shared outbound HTTP client."""
+import httpx
+
+# Connection limits for the shared client; keep-alive connections are reused
+# across requests so TLS handshakes are paid once per upstream connection
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_TIMEOUT = 10.0
+
+# Create the HTTP client. Attached to app.state.http by the app lifespan,
+# which also closes it on shutdown.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+    ),
+    timeout=HTTP_TIMEOUT
+)
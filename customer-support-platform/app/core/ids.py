@@ -0,0 +1,23 @@
+"""Primary key generation."""
+import os
+import time
+import uuid
+from uuid import UUID
+
+_RAND_MASK = (1 << 80) - 1
+_VERSION_MASK = ~(0xF << 76)
+_VARIANT_MASK = ~(0x3 << 62)
+
+
+def _uuid7() -> UUID:
+    """Build a version 7 UUID: 48-bit Unix milliseconds followed by random bits."""
+    millis = time.time_ns() // 1_000_000
+    value = (millis & 0xFFFFFFFFFFFF) << 80 | int.from_bytes(os.urandom(10), "big") & _RAND_MASK
+    value = value & _VERSION_MASK | 0x7 << 76
+    value = value & _VARIANT_MASK | 0x2 << 62
+    return UUID(int=value)
+
+
+# Time-ordered IDs keep primary key inserts on the right-most B-tree leaf
+# instead of scattering them across the index like uuid4 does
+uuid7 = getattr(uuid, "uuid7", _uuid7)
@@ -1,11 +1,14 @@
 """Message queue handler for processing various message types."""
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, Iterable, Optional
 from uuid import UUID
 
 from fastapi import BackgroundTasks
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.database import async_session_factory
 from app.core.logging import get_logger
+from app.core.message_queue import TICKET_QUEUE, MessageQueue, TicketQueueMessage
 from app.services.ticket_service import TicketService
 from app.tasks.ai_tasks import (
     classify_ticket_task,
@@ -23,9 +26,17 @@ logger = get_logger(__name__)
 class MessageQueueHandler:
     """Handler for processing different types of messages from the queue."""
 
-    @staticmethod
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory
+    ):
+        # Sessions come from the shared engine's pool instead of being
+        # constructed unbound per message.
+        self.session_factory = session_factory
+
     async def handle_ticket_message(
-        message: Dict[str, Any],
+        self,
+        message: TicketQueueMessage,
         background_tasks: Optional[BackgroundTasks] = None,
         db: Optional[AsyncSession] = None
     ) -> None:
@@ -33,21 +44,46 @@ class MessageQueueHandler:
         Handle ticket-related messages from the queue.
         
         Args:
-            message: Dictionary containing message data
+            message: Decoded ticket queue message
             background_tasks: Optional BackgroundTasks for async scheduling
-            db: Optional database session
+            db: Optional database session; one is opened from the
+                handler's session factory when omitted
             
-        Message format:
-        {
-            "ticket_id": str,
-            "action": str,  # "classify", "auto_resolve", "analyze", "notify"
-            "metadata": dict  # Optional additional data
-        }
+        Message format (``TicketQueueMessage``):
+            ticket_id: str
+            action: str  # "classify", "auto_resolve", "analyze", "notify"
+            metadata: dict  # Optional additional data
+        """
+        if db is None:
+            async with self.session_factory() as db:
+                await self._handle_in_session(db, message)
+        else:
+            await self._handle_in_session(db, message)
+
+    async def handle_ticket_batch(
+        self,
+        messages: Iterable[TicketQueueMessage]
+    ) -> None:
+        """
+        Handle a batch of ticket messages within a single session.
+
+        Used by consumers that pull ``prefetch_count`` messages at a time so
+        the session and transaction setup is paid once per batch.
         """
+        async with self.session_factory() as db:
+            for message in messages:
+                await self._handle_in_session(db, message)
+
+    @staticmethod
+    async def _handle_in_session(
+        db: AsyncSession,
+        message: TicketQueueMessage
+    ) -> None:
+        """Validate a ticket message and process it using ``db``."""
+        ticket_id = message.ticket_id
+        action = message.action
         try:
-            ticket_id = message.get("ticket_id")
-            action = message.get("action")
-            metadata = message.get("metadata", {})
+            metadata = message.metadata
 
             if not ticket_id or not action:
                 logger.error(
@@ -56,15 +92,9 @@ class MessageQueueHandler:
                 )
                 return
 
-            if not db:
-                async with AsyncSession() as db:
-                    await MessageQueueHandler._process_ticket_action(
-                        db, ticket_id, action, metadata
-                    )
-            else:
-                await MessageQueueHandler._process_ticket_action(
-                    db, ticket_id, action, metadata
-                )
+            await MessageQueueHandler._process_ticket_action(
+                db, ticket_id, action, metadata
+            )
 
         except Exception as e:
             logger.error(
@@ -189,6 +219,17 @@ class MessageQueueHandler:
             )
 
 # Singleton instance for convenience
+message_queue_handler = MessageQueueHandler()
 
 
-message_queue_handler = MessageQueueHandler()
+async def run_ticket_consumer() -> None:
+    """Consume the tickets queue, handling each delivered batch in one session."""
+    await MessageQueue.consume_batches(
+        TICKET_QUEUE,
+        message_queue_handler.handle_ticket_batch,
+        message_type=TicketQueueMessage
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(run_ticket_consumer())
@@ -1,19 +1,27 @@
 import aio_pika
-from aio_pika.abc import AbstractRobustConnection
+from aio_pika.abc import AbstractChannel, AbstractRobustConnection
 from aio_pika.pool import Pool
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, AsyncIterator, Dict, Set, Type
 import asyncio
 import json
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from functools import partial
 import logging
+import time
 from datetime import datetime
 from aio_pika import ExchangeType, Message
+from aio_pika.exceptions import ChannelNotFoundEntity
+import msgspec
 from app.config import settings
 
-from app.config import settings
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib parser
+    orjson = json
 
-# Connection pool settings
-POOL_SIZE = 2
+# Channel pool settings
+CHANNEL_POOL_SIZE = 10
 
 logger = logging.getLogger(__name__)
 
@@ -28,36 +36,91 @@ DLX_NAME = "dlx"
 DLQ_NAME = "dead_letter_queue"
 
 
+class TicketQueueMessage(msgspec.Struct):
+    """Envelope for messages published to the tickets queue."""
+    ticket_id: str
+    action: str  # "classify", "auto_resolve", "analyze", "notify"
+    metadata: dict = {}
+
+
+# Broker topology is declared once per process; these track what exists
+_dlx_declared = asyncio.Event()
+_dlx_lock = asyncio.Lock()
+_declared_queues: Set[str] = set()
+_queue_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Second-resolution ISO timestamp shared by publish/DLQ metadata
+_cached_ts = ""
+_cached_ts_second = 0
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time in ISO format, reformatted once per second."""
+    global _cached_ts, _cached_ts_second
+    now = int(time.time())
+    if now != _cached_ts_second:
+        _cached_ts_second = now
+        _cached_ts = datetime.utcfromtimestamp(now).isoformat()
+    return _cached_ts
+
+
+# One long-lived connection per process, multiplexing pooled channels
+_connection: Optional[AbstractRobustConnection] = None
+_connection_lock = asyncio.Lock()
+channel_pool: Optional[Pool] = None
+
+
 async def get_connection() -> AbstractRobustConnection:
-    """Create a new RabbitMQ connection."""
-    return await aio_pika.connect_robust(
-        host=settings.RABBITMQ_HOST,
-        port=settings.RABBITMQ_PORT,
-        login=settings.RABBITMQ_USER,
-        password=settings.RABBITMQ_PASSWORD,
-        virtualhost=settings.RABBITMQ_VHOST,
-        timeout=settings.RABBITMQ_CONNECTION_TIMEOUT,
-        heartbeat=settings.RABBITMQ_HEARTBEAT
-    )
+    """Return the shared RabbitMQ connection, connecting on first use."""
+    global _connection
+    async with _connection_lock:
+        if _connection is None or _connection.is_closed:
+            _connection = await aio_pika.connect_robust(
+                host=settings.RABBITMQ_HOST,
+                port=settings.RABBITMQ_PORT,
+                login=settings.RABBITMQ_USER,
+                password=settings.RABBITMQ_PASSWORD,
+                virtualhost=settings.RABBITMQ_VHOST,
+                timeout=settings.RABBITMQ_CONNECTION_TIMEOUT,
+                heartbeat=settings.RABBITMQ_HEARTBEAT
+            )
+    return _connection
 
 
-# Connection pool
-connection_pool: Optional[Pool] = None
+async def get_rabbitmq_channel() -> AbstractChannel:
+    """Open a dedicated channel on the shared connection."""
+    connection = await get_connection()
+    return await connection.channel()
 
 
 async def init_rabbitmq_pool():
-    """Initialize the RabbitMQ connection pool."""
-    global connection_pool
-    connection_pool = Pool(get_connection, max_size=POOL_SIZE)
+    """Initialize the RabbitMQ channel pool and declare the DLX once."""
+    global channel_pool
+    channel_pool = Pool(get_rabbitmq_channel, max_size=CHANNEL_POOL_SIZE)
+
+    if not _dlx_declared.is_set():
+        async with channel_pool.acquire() as channel:
+            await _ensure_dlx(channel)
 
 
-async def get_rabbitmq_channel():
-    """Get a channel from the connection pool."""
-    if connection_pool is None:
+async def _ensure_dlx(channel: AbstractChannel):
+    """Declare the dead letter exchange on ``channel`` if not done yet."""
+    if _dlx_declared.is_set():
+        return
+    async with _dlx_lock:
+        if not _dlx_declared.is_set():
+            await MessageQueue.setup_dead_letter_queue(channel)
+            _dlx_declared.set()
+
+
+@asynccontextmanager
+async def acquire_channel() -> AsyncIterator[AbstractChannel]:
+    """Borrow a channel from the pool for a short-lived operation."""
+    if channel_pool is None:
         await init_rabbitmq_pool()
-    
-    async with connection_pool.acquire() as connection:
-        return await connection.channel()
+
+    async with channel_pool.acquire() as channel:
+        yield channel
 
 
 class MessageQueue:
@@ -89,24 +152,52 @@ class MessageQueue:
     async def declare_queue(
         queue_name: str,
         durable: bool = True,
-        auto_delete: bool = False
+        auto_delete: bool = False,
+        channel=None
     ):
-        """Declare a queue with dead letter exchange configuration."""
-        async with await get_rabbitmq_channel() as channel:
-            # Create dead letter exchange if not exists
-            dlx = await MessageQueue.setup_dead_letter_queue(channel)
-            
-            # Declare the main queue with DLX configuration
-            queue = await channel.declare_queue(
-                queue_name,
-                durable=durable,
-                auto_delete=auto_delete,
-                arguments={
-                    'x-dead-letter-exchange': DLX_NAME,
-                    'x-message-ttl': 1000 * 60 * 60 * 24,  # 24h TTL
-                    'x-max-priority': 10
-                }
-            )
+        """
+        Declare a queue with dead letter exchange configuration.
+
+        Each queue is declared on the broker only once per process; later
+        calls return a local handle bound to ``channel`` without a
+        round-trip.
+        """
+        if channel is None:
+            async with acquire_channel() as channel:
+                return await MessageQueue.declare_queue(
+                    queue_name, durable, auto_delete, channel=channel
+                )
+
+        if queue_name in _declared_queues:
+            return await channel.get_queue(queue_name, ensure=False)
+
+        async with _queue_locks[queue_name]:
+            if queue_name in _declared_queues:
+                return await channel.get_queue(queue_name, ensure=False)
+
+            # Queues reference the DLX, so it must exist first
+            await _ensure_dlx(channel)
+
+            # Cheap existence check first; an existing queue is reused as-is
+            # so argument mismatches cannot make the broker reject it
+            try:
+                queue = await channel.declare_queue(queue_name, passive=True)
+            except ChannelNotFoundEntity:
+                # The broker closes the channel on a failed passive declare
+                await channel.reopen()
+
+                # Declare the main queue with DLX configuration
+                queue = await channel.declare_queue(
+                    queue_name,
+                    durable=durable,
+                    auto_delete=auto_delete,
+                    arguments={
+                        'x-dead-letter-exchange': DLX_NAME,
+                        'x-message-ttl': 1000 * 60 * 60 * 24,  # 24h TTL
+                        'x-max-priority': 10
+                    }
+                )
+            _declared_queues.add(queue_name)
             return queue
 
     @staticmethod
@@ -120,13 +211,16 @@ class MessageQueue:
     ):
         """Publish a message to a queue."""
         try:
-            async with await get_rabbitmq_channel() as channel:
-                # Ensure queue exists
-                queue = await MessageQueue.declare_queue(queue_name)
+            async with acquire_channel() as channel:
+                # Ensure queue exists (only until it has been declared once)
+                if queue_name not in _declared_queues:
+                    await MessageQueue.declare_queue(
+                        queue_name, channel=channel
+                    )
                 
                 # Add metadata
                 message.update({
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': _utc_timestamp(),
                     'retry_count': retry_count
                 })
                 
@@ -143,7 +237,7 @@ class MessageQueue:
                 # Publish message
                 await channel.default_exchange.publish(
                     message_body,
-                    routing_key=queue.name
+                    routing_key=queue_name
                 )
                 
                 logger.info(f"Published message to queue {queue_name}")
@@ -163,7 +257,7 @@ class MessageQueue:
             headers = message.headers or {}
             headers.update({
                 'x-death-reason': reason,
-                'x-death-time': datetime.utcnow().isoformat()
+                'x-death-time': _utc_timestamp()
             })
             
             # Create new message for DLQ
@@ -175,12 +269,9 @@ class MessageQueue:
                 delivery_mode=message.delivery_mode
             )
             
-            # Get DLX and publish
-            dlx = await channel.declare_exchange(
-                DLX_NAME,
-                ExchangeType.DIRECT,
-                durable=True
-            )
+            # Get DLX (declared on first use) and publish
+            await _ensure_dlx(channel)
+            dlx = await channel.get_exchange(DLX_NAME, ensure=False)
             await dlx.publish(dlq_message, routing_key=DLQ_NAME)
             
             logger.info(f"Moved message to DLQ: {reason}")
@@ -195,7 +286,7 @@ class MessageQueue:
         try:
             retry_count = message.headers.get('retry_count', 0)
             if retry_count >= 3:  # Max retries
-                async with await get_rabbitmq_channel() as channel:
+                async with acquire_channel() as channel:
                     await MessageQueue.move_to_dlq(
                         channel,
                         message,
@@ -210,7 +301,7 @@ class MessageQueue:
             delay = (2 ** retry_count) * 1000  # milliseconds
             
             # Republish with delay
-            async with await get_rabbitmq_channel() as channel:
+            async with acquire_channel() as channel:
                 await message.retry(
                     channel,
                     delay=delay,
@@ -229,41 +320,154 @@ class MessageQueue:
     @staticmethod
     async def consume(
         queue_name: str,
-        callback: Callable[[dict], Any],
-        prefetch_count: int = 10
+        callback: Callable[[Any], Any],
+        prefetch_count: int = 256,
+        ack_batch: int = 50,
+        ack_interval: float = 1.0,
+        message_type: Optional[Type[msgspec.Struct]] = None
     ):
-        """Consume messages from a queue."""
+        """
+        Consume messages from a queue.
+
+        Bodies are passed to ``callback`` as dicts, or decoded and validated
+        straight into ``message_type`` when a ``msgspec.Struct`` is given.
+
+        Successful messages are acknowledged in batches of ``ack_batch``
+        with a single ``multiple=True`` ack instead of one ack per message.
+        Pending acks are also flushed every ``ack_interval`` seconds so a
+        quiet queue does not leave processed messages unacknowledged.
+        """
         try:
             async with await get_rabbitmq_channel() as channel:
                 # Set QoS
                 await channel.set_qos(prefetch_count=prefetch_count)
                 
                 # Ensure queue exists
-                queue = await MessageQueue.declare_queue(queue_name)
+                queue = await MessageQueue.declare_queue(
+                    queue_name, channel=channel
+                )
+
+                if message_type is not None:
+                    decode = msgspec.json.Decoder(message_type).decode
+                else:
+                    decode = orjson.loads
+
+                acker = _AckBatcher(ack_batch)
+                flusher = asyncio.create_task(acker.flush_every(ack_interval))
                 
                 # Start consuming
-                async with queue.iterator() as queue_iter:
-                    async for message in queue_iter:
+                try:
+                    async with queue.iterator() as queue_iter:
+                        async for message in queue_iter:
+                            try:
+                                # Parse and process message
+                                await callback(decode(message.body))
+                            except Exception as e:
+                                logger.error(
+                                    f"Error processing message: {str(e)}",
+                                    exc_info=True
+                                )
+                                # Ack earlier successes before rejecting so
+                                # the multiple=True ack cannot cover this one
+                                await acker.flush()
+                                await message.nack(requeue=False)
+                                await MessageQueue.retry_failed_message(message)
+                            else:
+                                await acker.add(message)
+                finally:
+                    flusher.cancel()
+                    await acker.flush()
+                            
+        except Exception as e:
+            logger.error(f"Error in consumer: {str(e)}")
+            raise
+
+    @staticmethod
+    async def consume_batches(
+        queue_name: str,
+        callback: Callable[[list], Any],
+        batch_size: int = 50,
+        prefetch_count: int = 256,
+        message_type: Optional[Type[msgspec.Struct]] = None
+    ):
+        """
+        Consume messages from a queue and pass them to ``callback`` in lists.
+
+        A batch is whatever has already been delivered, up to ``batch_size``,
+        so a quiet queue never waits for a batch to fill. Each batch is
+        acknowledged with one ``multiple=True`` ack once ``callback``
+        returns; if it raises, every message in the batch is rejected and
+        goes through the usual retry/DLQ path.
+        """
+        if message_type is not None:
+            decode = msgspec.json.Decoder(message_type).decode
+        else:
+            decode = orjson.loads
+
+        try:
+            async with await get_rabbitmq_channel() as channel:
+                await channel.set_qos(prefetch_count=prefetch_count)
+                queue = await MessageQueue.declare_queue(
+                    queue_name, channel=channel
+                )
+
+                delivered: asyncio.Queue = asyncio.Queue()
+                consumer_tag = await queue.consume(delivered.put)
+                try:
+                    while True:
+                        batch = [await delivered.get()]
+                        while len(batch) < batch_size and not delivered.empty():
+                            batch.append(delivered.get_nowait())
+
                         try:
-                            async with message.process():
-                                # Parse message
-                                body = json.loads(message.body.decode())
-                                
-                                # Process message
-                                await callback(body)
-                                
+                            await callback([decode(message.body) for message in batch])
                         except Exception as e:
                             logger.error(
-                                f"Error processing message: {str(e)}",
+                                f"Error processing message batch: {str(e)}",
                                 exc_info=True
                             )
-                            await MessageQueue.retry_failed_message(message)
-                            
+                            for message in batch:
+                                await message.nack(requeue=False)
+                                await MessageQueue.retry_failed_message(message)
+                        else:
+                            await batch[-1].ack(multiple=True)
+                finally:
+                    await queue.cancel(consumer_tag)
+
         except Exception as e:
-            logger.error(f"Error in consumer: {str(e)}")
+            logger.error(f"Error in batch consumer: {str(e)}")
             raise
 
 
+class _AckBatcher:
+    """Acknowledge consumed messages in batches using ``multiple=True``."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._last: Optional[aio_pika.IncomingMessage] = None
+        self._pending = 0
+
+    async def add(self, message: aio_pika.IncomingMessage) -> None:
+        """Record a processed message, acking once the batch is full."""
+        self._last = message
+        self._pending += 1
+        if self._pending >= self.size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Ack every message up to the most recently processed one."""
+        if self._last is None:
+            return
+        message, self._last, self._pending = self._last, None, 0
+        await message.ack(multiple=True)
+
+    async def flush_every(self, interval: float) -> None:
+        """Periodically flush pending acks."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+
 async def process_dead_letter_queue(retry_interval: int = 3600):
     """Process messages in the dead letter queue periodically."""
     while True:
@@ -279,7 +483,7 @@ async def process_dead_letter_queue(retry_interval: int = 3600):
                     async for message in queue_iter:
                         async with message.process():
                             # Log failed message
-                            body = json.loads(message.body.decode())
+                            body = orjson.loads(message.body)
                             headers = message.headers or {}
                             
                             logger.error(
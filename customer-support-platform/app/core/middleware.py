@@ -1,5 +1,8 @@
 """Core middleware functionality."""
+import time
 from typing import Callable, Dict, Optional
+from uuid import uuid4
+
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -7,7 +10,8 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.types import ASGIApp
 
 from app.core.config import settings
-from app.core.logging import logger
+from app.core.logging import logger, request_id_ctx_var
+from app.utils.cache import request_cache_ctx_var
 
 
 def setup_middleware(app: FastAPI) -> None:
@@ -21,9 +25,6 @@ def setup_middleware(app: FastAPI) -> None:
         allow_headers=settings.CORS_HEADERS,
     )
 
-    # Request ID
-    app.add_middleware(RequestIDMiddleware)
-    
     # Rate Limiting
     app.add_middleware(RateLimitMiddleware)
     
@@ -36,15 +37,20 @@ def setup_middleware(app: FastAPI) -> None:
     # Error Handling
     app.add_middleware(ErrorHandlingMiddleware)
 
+    # Request ID - added last so it is the outermost middleware and the
+    # context variable it sets is inherited by everything below it
+    app.add_middleware(RequestIDMiddleware)
+
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Add unique request ID to each request."""
+    """Add unique request ID and an empty lookup cache to each request."""
     
     async def dispatch(
         self, request: Request, call_next: Callable
     ) -> Response:
         request_id = request.headers.get("X-Request-ID", str(uuid4()))
-        request.state.request_id = request_id
+        request_id_ctx_var.set(request_id)
+        request_cache_ctx_var.set({})
         response = await call_next(request)
         response.headers["X-Request-ID"] = request_id
         return response
@@ -62,7 +68,7 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             logger.exception(
                 "Unhandled error",
                 extra={
-                    "request_id": getattr(request.state, "request_id", None),
+                    "request_id": request_id_ctx_var.get(),
                     "path": request.url.path,
                     "method": request.method,
                 }
@@ -77,7 +83,7 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 status_code=500,
                 content={
                     "detail": "Internal server error",
-                    "request_id": getattr(request.state, "request_id", None)
+                    "request_id": request_id_ctx_var.get()
                 }
             )
 
@@ -99,7 +105,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         logger.info(
             "Request processed",
             extra={
-                "request_id": getattr(request.state, "request_id", None),
+                "request_id": request_id_ctx_var.get(),
                 "method": request.method,
                 "path": request.url.path,
                 "duration": duration,
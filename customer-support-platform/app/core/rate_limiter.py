@@ -1,11 +1,36 @@
 """Rate limiting utilities using Redis."""
 from functools import wraps
-from typing import Callable, Optional
-from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException, Request, Response, status
 from app.core.redis import get_redis
 from app.core.config import settings
 
+# 429 responses are fully static per window, so the body and encoded
+# headers are built once. Each rejection still gets its own Response:
+# FastAPI attaches background tasks to a returned Response, so a shared
+# instance would carry one request's tasks into every later 429.
+_RATE_LIMITED_BODY = b'{"detail":"Rate limit exceeded"}'
+_rate_limited_headers: Dict[int, List[Tuple[bytes, bytes]]] = {}
+
+
+def _rate_limited_response(window: int) -> Response:
+    """Build a 429 response for a rate limit window from the cached parts."""
+    raw_headers = _rate_limited_headers.get(window)
+    if raw_headers is None:
+        raw_headers = Response(
+            content=_RATE_LIMITED_BODY,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            media_type="application/json",
+            headers={"Retry-After": str(window)}
+        ).raw_headers
+        _rate_limited_headers[window] = raw_headers
+
+    response = Response(status_code=status.HTTP_429_TOO_MANY_REQUESTS)
+    response.body = _RATE_LIMITED_BODY
+    response.raw_headers = list(raw_headers)
+    return response
+
+
 class RateLimiter:
     """Redis-based rate limiter."""
     
@@ -63,11 +88,7 @@ def rate_limit(
             
             is_limited = await limiter.is_rate_limited(rate_key, limit, window)
             if is_limited:
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={"detail": "Rate limit exceeded"},
-                    headers={"Retry-After": str(window)}
-                )
+                return _rate_limited_response(window)
                 
             return await func(request, *args, **kwargs)
         return wrapper
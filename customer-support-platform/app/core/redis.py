@@ -1,21 +1,22 @@
-import json
+import hashlib
 import logging
+import time
+import msgspec
 from redis import asyncio as aioredis
 from typing import Optional, Any
 from fastapi import HTTPException, status
-from datetime import datetime
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Create Redis connection pool
+# Create Redis connection pool. Responses stay as bytes so cached values can
+# be handed straight to the msgpack decoder.
 redis_pool = aioredis.ConnectionPool(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
     db=settings.REDIS_DB,
     password=settings.REDIS_PASSWORD,
-    decode_responses=True,
     max_connections=settings.REDIS_POOL_SIZE,
     timeout=settings.REDIS_POOL_TIMEOUT,
     ssl=settings.REDIS_SSL
@@ -24,6 +25,32 @@ redis_pool = aioredis.ConnectionPool(
 # Create Redis client
 redis = aioredis.Redis(connection_pool=redis_pool)
 
+# Shared serializers for cached values
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder()
+
+
+# Sliding-window check executed atomically on the server in one round-trip.
+# Returns the number of requests already in the window; the current request
+# is only recorded when it is allowed.
+_RATE_LIMIT_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window_start = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', window_start)
+local current = redis.call('ZCARD', key)
+if current < limit then
+    redis.call('ZADD', key, now, now)
+end
+redis.call('EXPIRE', key, ttl)
+return current
+"""
+
+# Script objects run via EVALSHA and reload the script on NOSCRIPT
+_rate_limit_script = redis.register_script(_RATE_LIMIT_LUA)
+
 
 class RateLimiter:
     """Rate limiting implementation using Redis."""
@@ -44,37 +71,64 @@ class RateLimiter:
         Returns (is_limited, rate_info).
         """
         redis_key = f"{self.key_prefix}:{key}"
-        
-        async with redis.pipeline(transaction=True) as pipe:
-            now = datetime.utcnow().timestamp()
-            window_start = now - self.window
-            
-            try:
-                # Remove old requests
-                await pipe.zremrangebyscore(redis_key, "-inf", window_start)
-                # Count requests in current window
-                await pipe.zcard(redis_key)
-                # Add current request
-                await pipe.zadd(redis_key, {str(now): now})
-                # Set expiry
-                await pipe.expire(redis_key, self.window)
-                
-                _, current_requests, _, _ = await pipe.execute()
-                
-                is_limited = current_requests >= self.limit
-                reset_time = window_start + self.window
-                
-                rate_info = {
-                    "limit": self.limit,
-                    "remaining": max(0, self.limit - current_requests),
-                    "reset": int(reset_time),
-                }
-                
-                return is_limited, rate_info
-                
-            except Exception as e:
-                # Log error here
-                return False, {"error": str(e)}
+        now = time.time()
+        window_start = now - self.window
+
+        try:
+            current_requests = await _rate_limit_script(
+                keys=[redis_key],
+                args=[now, window_start, self.limit, self.window]
+            )
+
+            is_limited = current_requests >= self.limit
+            reset_time = window_start + self.window
+
+            rate_info = {
+                "limit": self.limit,
+                "remaining": max(0, self.limit - current_requests),
+                "reset": int(reset_time),
+            }
+
+            return is_limited, rate_info
+
+        except Exception as e:
+            # Log error here
+            return False, {"error": str(e)}
+
+
+class FixedWindowRateLimiter(RateLimiter):
+    """
+    Fixed-window counter: one INCR per request on a key per window bucket.
+
+    Cheaper than the sliding window for high-traffic limits where bursts at
+    window boundaries are acceptable.
+    """
+
+    async def is_rate_limited(self, key: str) -> tuple[bool, dict]:
+        """
+        Check if the request should be rate limited.
+        Returns (is_limited, rate_info).
+        """
+        bucket = int(time.time()) // self.window
+        redis_key = f"{self.key_prefix}:{key}:{bucket}"
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.incr(redis_key)
+                pipe.expire(redis_key, self.window)
+                current_requests, _ = await pipe.execute()
+
+            rate_info = {
+                "limit": self.limit,
+                "remaining": max(0, self.limit - current_requests),
+                "reset": (bucket + 1) * self.window,
+            }
+
+            return current_requests > self.limit, rate_info
+
+        except Exception as e:
+            # Log error here
+            return False, {"error": str(e)}
 
 
 class Cache:
@@ -90,7 +144,7 @@ class Cache:
         try:
             await redis.set(
                 key,
-                json.dumps(value),
+                _encoder.encode(value),
                 ex=expire
             )
         except Exception as e:
@@ -105,11 +159,50 @@ class Cache:
         """Get a cached value."""
         try:
             data = await redis.get(key)
-            return json.loads(data) if data else None
+            return _decoder.decode(data) if data else None
+        except Exception as e:
+            # Log error here
+            return None
+
+    @staticmethod
+    async def set_bytes(key: str, value: bytes, expire: int = 3600) -> None:
+        """Store an already serialized value as-is."""
+        try:
+            await redis.set(key, value, ex=expire)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Cache error: {str(e)}"
+            )
+
+    @staticmethod
+    async def get_bytes(key: str) -> Optional[bytes]:
+        """Get a cached value without decoding it."""
+        try:
+            return await redis.get(key)
         except Exception as e:
             # Log error here
             return None
 
+    @staticmethod
+    async def incr(key: str) -> Optional[int]:
+        """Increment an integer value, creating it at 1 if missing."""
+        try:
+            return await redis.incr(key)
+        except Exception as e:
+            # Log error here
+            return None
+
+    @staticmethod
+    def pipeline():
+        """
+        Queue several commands and send them in one round-trip.
+
+        Non-transactional; use as ``async with Cache.pipeline() as pipe``
+        and ``await pipe.execute()``.
+        """
+        return redis.pipeline(transaction=False)
+
     @staticmethod
     async def delete(key: str) -> bool:
         """Delete a cached value."""
@@ -129,9 +222,71 @@ class Cache:
             return False
 
 
+# Adds to a counter only while it is seeded, so a missing key always means
+# "recompute from the database" rather than a partial sum
+_INCR_IF_EXISTS_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return false
+"""
+
+_incr_if_exists_script = redis.register_script(_INCR_IF_EXISTS_LUA)
+
+
+class Counter:
+    """Integer aggregates kept in Redis and seeded from the database on a miss."""
+
+    @staticmethod
+    async def get(key: str) -> Optional[int]:
+        """Get a counter value, or None if it has not been seeded."""
+        try:
+            data = await redis.get(key)
+            return int(data) if data is not None else None
+        except Exception as e:
+            logger.error(f"Counter read failed for {key}: {e}")
+            return None
+
+    @staticmethod
+    async def seed(key: str, value: int, expire: int) -> None:
+        """
+        Store a freshly computed value unless another writer got there first.
+
+        The TTL bounds how long a seed that missed a concurrent write, or a
+        change made outside the CRUD layer, can be served.
+        """
+        try:
+            await redis.set(key, value, ex=expire, nx=True)
+        except Exception as e:
+            logger.error(f"Counter seed failed for {key}: {e}")
+
+    @staticmethod
+    async def incr(key: str, amount: int) -> None:
+        """Apply a change to a seeded counter; unseeded counters are left alone."""
+        if not amount:
+            return
+        try:
+            await _incr_if_exists_script(keys=[key], args=[amount])
+        except Exception as e:
+            # The counter is recomputed once its TTL lapses
+            logger.error(f"Counter increment failed for {key}: {e}")
+
+
 # Token cache settings
 TOKEN_CACHE_PREFIX = "token:"
 TOKEN_CACHE_EXPIRE = 3600  # 1 hour
+# Channel Redis pushes client-side caching (CLIENT TRACKING) invalidations to
+TOKEN_TRACKING_CHANNEL = "__redis__:invalidate"
+# Set of live token cache keys, so bulk invalidation never needs KEYS
+TOKEN_INDEX_KEY = "token_index"
+TOKEN_INDEX_BATCH = 500
+
+
+def token_cache_key(user_id: str) -> str:
+    """Build a fixed-size cache key so raw JWTs are never used as Redis keys."""
+    return TOKEN_CACHE_PREFIX + hashlib.blake2b(
+        user_id.encode(), digest_size=16
+    ).hexdigest()
 
 
 class TokenCache:
@@ -140,13 +295,12 @@ class TokenCache:
     @staticmethod
     async def cache_token(user_id: str, token_data: dict, expire: int = TOKEN_CACHE_EXPIRE) -> None:
         """Cache token data for a user."""
-        key = f"{TOKEN_CACHE_PREFIX}{user_id}"
+        key = token_cache_key(user_id)
         try:
-            await redis.set(
-                key,
-                json.dumps(token_data),
-                ex=expire
-            )
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(key, _encoder.encode(token_data), ex=expire)
+                pipe.sadd(TOKEN_INDEX_KEY, key)
+                await pipe.execute()
         except Exception as e:
             logger.error(f"Failed to cache token: {e}")
             raise
@@ -154,11 +308,11 @@ class TokenCache:
     @staticmethod
     async def get_cached_token(user_id: str) -> Optional[dict]:
         """Get cached token data for a user."""
-        key = f"{TOKEN_CACHE_PREFIX}{user_id}"
+        key = token_cache_key(user_id)
         try:
             data = await redis.get(key)
             if data:
-                return json.loads(data)
+                return _decoder.decode(data)
             return None
         except Exception as e:
             logger.error(f"Failed to get cached token: {e}")
@@ -167,9 +321,12 @@ class TokenCache:
     @staticmethod
     async def invalidate_token(user_id: str) -> None:
         """Invalidate cached token for a user."""
-        key = f"{TOKEN_CACHE_PREFIX}{user_id}"
+        key = token_cache_key(user_id)
         try:
-            await redis.delete(key)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(key)
+                pipe.srem(TOKEN_INDEX_KEY, key)
+                await pipe.execute()
         except Exception as e:
             logger.error(f"Failed to invalidate token: {e}")
             raise
@@ -178,16 +335,24 @@ class TokenCache:
     async def invalidate_all_tokens() -> None:
         """Invalidate all cached tokens."""
         try:
-            keys = await redis.keys(f"{TOKEN_CACHE_PREFIX}*")
-            if keys:
-                await redis.delete(*keys)
+            batch = []
+            async for key in redis.sscan_iter(
+                TOKEN_INDEX_KEY, count=TOKEN_INDEX_BATCH
+            ):
+                batch.append(key)
+                if len(batch) >= TOKEN_INDEX_BATCH:
+                    await redis.delete(*batch)
+                    batch = []
+            if batch:
+                await redis.delete(*batch)
+            await redis.delete(TOKEN_INDEX_KEY)
         except Exception as e:
             logger.error(f"Failed to invalidate all tokens: {e}")
             raise
 
 
 # Default rate limiter instances
-api_limiter = RateLimiter(
+api_limiter = FixedWindowRateLimiter(
     key_prefix="api_rate",
     limit=settings.RATE_LIMITS["api_endpoints"]["requests"],
     window=settings.RATE_LIMITS["api_endpoints"]["window_seconds"]
@@ -1,13 +1,84 @@
-from typing import Optional
+from typing import Dict, Optional
+from cachetools import TTLCache
+from redis import asyncio as aioredis
 from fastapi_keycloak import FastAPIKeycloak, OIDCUser, UsernamePassword
 from fastapi import HTTPException, status, Depends
+from pydantic import TypeAdapter
 from app.config import settings
-from app.core.redis import TokenCache
+from app.core.redis import (
+    TokenCache,
+    TOKEN_CACHE_PREFIX,
+    TOKEN_TRACKING_CHANNEL,
+    redis,
+    redis_pool,
+    token_cache_key,
+)
 
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# In-process cache of validated users keyed by their Redis token key, checked
+# before Redis so hot tokens skip the network round-trip entirely. Entries are
+# evicted by Redis tracking invalidations; the TTL only bounds staleness if
+# the listener is down.
+_local_tokens: TTLCache = TTLCache(maxsize=8192, ttl=60)
+
+# Validator for cached user claims, built once instead of per request
+_oidc_adapter = TypeAdapter(OIDCUser)
+
+# Keycloak validations in progress, keyed like _local_tokens
+_inflight_validations: Dict[str, asyncio.Future] = {}
+
+# Fire-and-forget token cache writes; referenced here so they are not collected
+_pending_cache_writes: set = set()
+
+
+def _on_cache_write_done(task: asyncio.Task) -> None:
+    """Drop a finished cache write and log it if it failed."""
+    _pending_cache_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Failed to cache validated token: {task.exception()}")
+
+
+async def listen_for_token_invalidation() -> None:
+    """
+    Evict tokens from the in-process cache when Redis reports they changed.
+
+    Uses Redis client-side caching in broadcast mode: a tracking connection
+    asks Redis to report every write, delete or expiry of a ``token:`` key,
+    and redirects those notifications to this subscriber connection.
+    """
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    # Claim the subscriber connection up front so its client ID is known
+    # before it enters subscribed mode
+    pubsub.connection = await redis_pool.get_connection("_")
+    await pubsub.connection.send_command("CLIENT", "ID")
+    subscriber_id = await pubsub.connection.read_response()
+    await pubsub.subscribe(TOKEN_TRACKING_CHANNEL)
+
+    tracker = aioredis.Redis(connection_pool=redis_pool, single_connection_client=True)
+    await tracker.execute_command(
+        "CLIENT", "TRACKING", "ON",
+        "REDIRECT", subscriber_id,
+        "BCAST", "PREFIX", TOKEN_CACHE_PREFIX
+    )
+    try:
+        async for message in pubsub.listen():
+            keys = message["data"]
+            if keys is None:
+                # Redis was flushed
+                _local_tokens.clear()
+                continue
+            for key in keys:
+                _local_tokens.pop(key.decode(), None)
+    finally:
+        await tracker.execute_command("CLIENT", "TRACKING", "OFF")
+        await tracker.close()
+        await pubsub.unsubscribe(TOKEN_TRACKING_CHANNEL)
+        await pubsub.close()
+
 # Initialize Keycloak instance
 keycloak = FastAPIKeycloak(
     server_url=settings.KEYCLOAK_BASE_URL,
@@ -26,21 +97,49 @@ async def get_current_user(
     token: str = Depends(keycloak.oauth2_scheme)
 ) -> OIDCUser:
     """Get current authenticated user from Keycloak token."""
+    token_key = token_cache_key(token)
+    user = _local_tokens.get(token_key)
+    if user is not None:
+        return user
+
     try:
         # Try to get user info from cache
         token_info = await TokenCache.get_cached_token(token)
         if token_info:
-            return OIDCUser(**token_info)
+            user = _oidc_adapter.validate_python(token_info)
+            _local_tokens[token_key] = user
+            return user
         
-        # If not in cache, validate with Keycloak
-        user = await keycloak.get_current_user(token)
+        # If not in cache, validate with Keycloak. Concurrent requests with
+        # the same token share a single in-flight validation.
+        pending = _inflight_validations.get(token_key)
+        if pending is not None:
+            return await pending
+
+        pending = asyncio.get_running_loop().create_future()
+        _inflight_validations[token_key] = pending
+        try:
+            user = await keycloak.get_current_user(token)
+            pending.set_result(user)
+        except Exception as e:
+            pending.set_exception(e)
+            # Mark as retrieved in case no other request was waiting
+            pending.exception()
+            raise
+        finally:
+            _inflight_validations.pop(token_key, None)
+            if not pending.done():
+                pending.cancel()
         
-        # Cache the validated token
-        await TokenCache.cache_token(
+        # Cache the validated token without holding up the response
+        task = asyncio.create_task(TokenCache.cache_token(
             token,
             user.model_dump(),
             expire=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-        )
+        ))
+        _pending_cache_writes.add(task)
+        task.add_done_callback(_on_cache_write_done)
+        _local_tokens[token_key] = user
         return user
     except Exception as e:
         logger.warning(f"Token validation failed: {e}")
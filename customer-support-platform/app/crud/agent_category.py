@@ -1,8 +1,11 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.models.agent_category import AgentCategoryAssignment as AgentCategoryAssignmentModel
+# Agent category assignments are stored as user/category rows
+from app.models.categories import UserCategoryAssignment as AgentCategoryAssignmentModel
 from app.schemas.agent_category import (
     AgentCategoryAssignmentCreate,
     AgentCategoryAssignmentUpdate,
@@ -15,109 +18,130 @@ class CRUDAgentCategory(CRUDBase[
     AgentCategoryAssignmentCreate,
     AgentCategoryAssignmentUpdate
 ]):
-    def get_by_agent_and_category(
+    async def get_by_agent_and_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         agent_id: str,
         category_id: str
     ) -> Optional[AgentCategoryAssignmentModel]:
-        return db.query(AgentCategoryAssignmentModel).filter(
-            and_(
-                AgentCategoryAssignmentModel.id == agent_id,
+        result = await db.execute(
+            select(AgentCategoryAssignmentModel).where(and_(
+                AgentCategoryAssignmentModel.user_id == agent_id,
                 AgentCategoryAssignmentModel.category_id == category_id
-            )
-        ).first()
+            ))
+        )
+        return result.scalars().first()
 
-    def get_multi_by_agent(
+    async def get_multi_by_agent(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         agent_id: str,
         skip: int = 0,
         limit: int = 100
     ) -> List[AgentCategoryAssignmentModel]:
-        return (
-            db.query(AgentCategoryAssignmentModel)
-            .filter(AgentCategoryAssignmentModel.id == agent_id)
+        result = await db.execute(
+            select(AgentCategoryAssignmentModel)
+            .where(AgentCategoryAssignmentModel.user_id == agent_id)
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
 
-    def get_multi_by_category(
+    async def get_multi_by_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         category_id: str,
         skip: int = 0,
         limit: int = 100
     ) -> List[AgentCategoryAssignmentModel]:
-        return (
-            db.query(AgentCategoryAssignmentModel)
-            .filter(AgentCategoryAssignmentModel.category_id == category_id)
+        result = await db.execute(
+            select(AgentCategoryAssignmentModel)
+            .where(AgentCategoryAssignmentModel.category_id == category_id)
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
 
-    def create_with_agent_and_category(
+    async def create_with_agent_and_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         agent_id: str,
         category_id: str
     ) -> AgentCategoryAssignmentModel:
-        db_obj = AgentCategoryAssignmentModel(
-            id=agent_id,
-            category_id=category_id
+        result = await db.execute(
+            insert(AgentCategoryAssignmentModel).values(
+                user_id=agent_id,
+                category_id=category_id
+            ).returning(AgentCategoryAssignmentModel)
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db_obj = result.scalar_one()
+        await db.commit()
         return db_obj
 
-    def remove_by_agent_and_category(
+    async def bulk_create(
         self,
-        db: Session,
+        db: AsyncSession,
+        *,
+        pairs: List[Tuple[str, str]]
+    ) -> None:
+        """Assign many (agent_id, category_id) pairs in one statement, skipping existing ones."""
+        if not pairs:
+            return
+        stmt = pg_insert(AgentCategoryAssignmentModel).values([
+            {"user_id": agent_id, "category_id": category_id}
+            for agent_id, category_id in pairs
+        ]).on_conflict_do_nothing(index_elements=["user_id", "category_id"])
+        await db.execute(stmt)
+        await db.commit()
+
+    async def remove_by_agent_and_category(
+        self,
+        db: AsyncSession,
         *,
         agent_id: str,
         category_id: str
     ) -> Optional[AgentCategoryAssignmentModel]:
-        obj = db.query(AgentCategoryAssignmentModel).filter(
-            and_(
-                AgentCategoryAssignmentModel.id == agent_id,
+        result = await db.execute(
+            delete(AgentCategoryAssignmentModel).where(and_(
+                AgentCategoryAssignmentModel.user_id == agent_id,
                 AgentCategoryAssignmentModel.category_id == category_id
-            )
-        ).first()
-        if obj:
-            db.delete(obj)
-            db.commit()
+            )).returning(AgentCategoryAssignmentModel)
+        )
+        obj = result.scalars().first()
+        await db.commit()
         return obj
 
-    def remove_by_agent(
+    async def remove_by_agent(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         agent_id: str
-    ) -> int:
-        result = db.query(AgentCategoryAssignmentModel).filter(
-            AgentCategoryAssignmentModel.id == agent_id
-        ).delete()
-        db.commit()
-        return result
+    ) -> List[UUID]:
+        """Delete matching assignments and return the removed IDs."""
+        result = await db.execute(delete(AgentCategoryAssignmentModel).where(
+            AgentCategoryAssignmentModel.user_id == agent_id
+        ).returning(AgentCategoryAssignmentModel.id))
+        ids = result.scalars().all()
+        await db.commit()
+        return ids
 
-    def remove_by_category(
+    async def remove_by_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         category_id: str
-    ) -> int:
-        result = db.query(AgentCategoryAssignmentModel).filter(
+    ) -> List[UUID]:
+        """Delete matching assignments and return the removed IDs."""
+        result = await db.execute(delete(AgentCategoryAssignmentModel).where(
             AgentCategoryAssignmentModel.category_id == category_id
-        ).delete()
-        db.commit()
-        return result
+        ).returning(AgentCategoryAssignmentModel.id))
+        ids = result.scalars().all()
+        await db.commit()
+        return ids
 
 
 agent_category = CRUDAgentCategory(AgentCategoryAssignmentModel)
@@ -1,14 +1,65 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Sequence, Union
 from datetime import date, datetime
 from uuid import UUID
-from sqlalchemy import select, func, and_, or_
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, and_, or_, literal_column, text, update, RowMapping
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
 
-from app.models.analytics import TicketAnalytics
+from app.models.analytics import TicketAnalytics, ticket_analytics_daily
+from app.models.categories import Category
+from app.models.core import Organization
+from app.models.tickets import Ticket
 from app.schemas.analytics import TicketAnalyticsCreate, TicketAnalyticsUpdate
 from app.crud.base import CRUDBase
 
+# Columns get_aggregated_metrics may group by, resolved once at import
+_GROUPABLE: Dict[str, InstrumentedAttribute] = {
+    name: getattr(TicketAnalytics, name)
+    for name in ("organization_id", "category_id", "agent_id", "date")
+}
+
+# Columns exported per analytics row by stream_metrics_in_date_range
+_METRIC_COLUMNS = (
+    TicketAnalytics.date,
+    TicketAnalytics.category_id,
+    TicketAnalytics.agent_id,
+    TicketAnalytics.total_tickets,
+    TicketAnalytics.resolved_tickets,
+    TicketAnalytics.crit_low,
+    TicketAnalytics.crit_medium,
+    TicketAnalytics.crit_high,
+    TicketAnalytics.crit_critical,
+    TicketAnalytics.avg_resolution_time_hours,
+)
+
+# Ticket states counted as resolved in organization stats
+_RESOLVED_STATUSES = ("resolved", "closed")
+_EMPTY_JSONB_ARRAY = literal_column("'[]'::jsonb", JSONB)
+
+
+def _jsonb_object(*pairs: Any):
+    return func.jsonb_build_object(*pairs, type_=JSONB)
+
+
+def _jsonb_rows(subquery, *columns: str, order_by: str):
+    """
+    Aggregate a grouped subquery into a JSON array of objects.
+
+    Rows are ordered by ``order_by`` descending, ties broken by the first
+    column, so the same data always encodes to the same bytes.
+    """
+    row = _jsonb_object(
+        *(part for name in columns for part in (name, subquery.c[name]))
+    )
+    ordered = aggregate_order_by(
+        row,
+        subquery.c[order_by].desc(),
+        subquery.c[columns[0]]
+    )
+    return func.coalesce(func.jsonb_agg(ordered), _EMPTY_JSONB_ARRAY, type_=JSONB)
+
 
 class CRUDAnalytics(CRUDBase[TicketAnalytics, TicketAnalyticsCreate, TicketAnalyticsUpdate]):
     async def get_by_organization_and_date(
@@ -33,9 +84,25 @@ class CRUDAnalytics(CRUDBase[TicketAnalytics, TicketAnalyticsCreate, TicketAnaly
         start_date: date,
         end_date: date,
         category_id: Optional[UUID] = None,
-        agent_id: Optional[UUID] = None
-    ) -> List[TicketAnalytics]:
-        query = select(TicketAnalytics).where(
+        agent_id: Optional[UUID] = None,
+        columns: Optional[List[Any]] = None
+    ) -> Union[List[TicketAnalytics], List[RowMapping]]:
+        """
+        Get analytics rows for an organization within a date range.
+
+        When ``columns`` is given only those columns are selected and rows
+        come back as mappings, skipping ORM object hydration. Otherwise full
+        ``TicketAnalytics`` instances are returned with their category and
+        agent loaded.
+        """
+        if columns:
+            query = select(*columns)
+        else:
+            query = select(TicketAnalytics).options(
+                selectinload(TicketAnalytics.category),
+                selectinload(TicketAnalytics.agent)
+            )
+        query = query.where(
             TicketAnalytics.organization_id == organization_id,
             TicketAnalytics.date >= start_date,
             TicketAnalytics.date <= end_date
@@ -47,8 +114,38 @@ class CRUDAnalytics(CRUDBase[TicketAnalytics, TicketAnalyticsCreate, TicketAnaly
             query = query.where(TicketAnalytics.agent_id == agent_id)
             
         result = await db.execute(query)
+        if columns:
+            return result.mappings().all()
         return result.scalars().all()
 
+    async def stream_metrics_in_date_range(
+        self,
+        db: AsyncSession,
+        organization_id: UUID,
+        start_date: date,
+        end_date: date,
+        batch_size: int = 500
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Yield an organization's analytics rows for a date range in batches.
+
+        Rows are read through a server-side cursor, so only one batch is held
+        in memory at a time.
+        """
+        query = (
+            select(*_METRIC_COLUMNS)
+            .where(
+                TicketAnalytics.organization_id == organization_id,
+                TicketAnalytics.date >= start_date,
+                TicketAnalytics.date <= end_date
+            )
+            .order_by(TicketAnalytics.date)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(query)
+        async for rows in result.mappings().partitions():
+            yield rows
+
     async def get_aggregated_metrics(
         self,
         db: AsyncSession,
@@ -63,14 +160,23 @@ class CRUDAnalytics(CRUDBase[TicketAnalytics, TicketAnalyticsCreate, TicketAnaly
         select_fields = [
             func.sum(TicketAnalytics.total_tickets).label("total_tickets"),
             func.sum(TicketAnalytics.resolved_tickets).label("resolved_tickets"),
+            func.sum(TicketAnalytics.crit_low).label("crit_low"),
+            func.sum(TicketAnalytics.crit_medium).label("crit_medium"),
+            func.sum(TicketAnalytics.crit_high).label("crit_high"),
+            func.sum(TicketAnalytics.crit_critical).label("crit_critical"),
             func.avg(TicketAnalytics.avg_resolution_time_hours).label("avg_resolution_time_hours")
         ]
         
-        group_by_fields = []
-        for field in group_by:
-            if hasattr(TicketAnalytics, field):
-                select_fields.append(getattr(TicketAnalytics, field))
-                group_by_fields.append(getattr(TicketAnalytics, field))
+        unknown = [field for field in group_by if field not in _GROUPABLE]
+        if unknown:
+            # group_by comes straight from query parameters
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot group analytics by: {', '.join(unknown)}"
+            )
+
+        group_by_fields = [_GROUPABLE[field] for field in group_by]
+        select_fields.extend(group_by_fields)
         
         query = select(*select_fields).where(
             TicketAnalytics.organization_id == organization_id,
@@ -82,7 +188,185 @@ class CRUDAnalytics(CRUDBase[TicketAnalytics, TicketAnalyticsCreate, TicketAnaly
             query = query.group_by(*group_by_fields)
             
         result = await db.execute(query)
-        return [dict(row) for row in result.all()]
+        return [dict(row) for row in result.mappings()]
+
+    async def get_all_org_stats(
+        self,
+        db: AsyncSession,
+        organization_id: UUID,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, Any]:
+        """
+        Compute the organization stats bundle in a single round-trip.
+
+        The organization's rows of the ``ticket_analytics_daily`` view for the
+        window are read once into a CTE; each result group is a scalar
+        subquery over it that folds its rows into JSONB, so the statement
+        returns one row with a column per group.
+        """
+        daily = ticket_analytics_daily.c
+        org_daily = (
+            select(ticket_analytics_daily)
+            .where(
+                daily.organization_id == organization_id,
+                daily.day.between(start_date.date(), end_date.date())
+            )
+            .cte("org_daily")
+        )
+        resolved = org_daily.c.status.in_(_RESOLVED_STATUSES)
+        tickets = func.sum(org_daily.c.ticket_count)
+        resolved_tickets = func.coalesce(tickets.filter(resolved), 0)
+        avg_resolution_time = func.sum(org_daily.c.resolution_hours_sum) / func.nullif(
+            func.sum(org_daily.c.resolution_count), 0
+        )
 
+        ticket_stats = select(
+            _jsonb_object(
+                "total_tickets", func.coalesce(tickets, 0),
+                "open_tickets", func.coalesce(tickets.filter(~resolved), 0),
+                "resolved_tickets", resolved_tickets,
+                "avg_resolution_time", avg_resolution_time,
+                "high_priority", func.coalesce(
+                    tickets.filter(
+                        org_daily.c.criticality.in_(("high", "critical"))
+                    ),
+                    0
+                ),
+                "low_priority", func.coalesce(
+                    tickets.filter(org_daily.c.criticality == "low"), 0
+                )
+            )
+        )
+
+        category_counts = (
+            select(
+                org_daily.c.category_id,
+                Category.name,
+                tickets.label("count")
+            )
+            .select_from(org_daily)
+            .outerjoin(Category, Category.id == org_daily.c.category_id)
+            .group_by(org_daily.c.category_id, Category.name)
+            .subquery()
+        )
+        category_distribution = select(
+            _jsonb_rows(
+                category_counts,
+                "category_id",
+                "name",
+                "count",
+                order_by="count"
+            )
+        )
+
+        agent_counts = (
+            select(
+                org_daily.c.agent_id,
+                tickets.label("assigned_tickets"),
+                resolved_tickets.label("resolved_tickets"),
+                avg_resolution_time.label("avg_resolution_time")
+            )
+            .where(org_daily.c.agent_id.is_not(None))
+            .group_by(org_daily.c.agent_id)
+            .subquery()
+        )
+        agent_performance = select(
+            _jsonb_rows(
+                agent_counts,
+                "agent_id",
+                "assigned_tickets",
+                "resolved_tickets",
+                "avg_resolution_time",
+                order_by="assigned_tickets"
+            )
+        )
+
+        response_times = select(
+            _jsonb_object(
+                "average_first_response",
+                func.sum(org_daily.c.first_response_hours_sum) / func.nullif(
+                    func.sum(org_daily.c.first_response_count), 0
+                ),
+                "average_resolution_time", avg_resolution_time,
+                "within_sla",
+                100.0 * func.sum(org_daily.c.within_sla_count) / func.nullif(
+                    func.sum(org_daily.c.resolution_count), 0
+                )
+            )
+        )
+
+        source_counts = (
+            select(org_daily.c.channel.label("source"), tickets.label("count"))
+            .group_by(org_daily.c.channel)
+            .subquery()
+        )
+        ticket_sources = select(
+            _jsonb_rows(source_counts, "source", "count", order_by="count")
+        )
+
+        # Lifetime counters are denormalized onto the organization row
+        lifetime = select(
+            _jsonb_object(
+                "total_tickets", Organization.total_ticket_count,
+                "open_tickets", Organization.open_ticket_count,
+                "last_closed_at", Organization.last_closed_at
+            )
+        ).where(Organization.id == organization_id)
+
+        result = await db.execute(
+            select(
+                ticket_stats.scalar_subquery().label("ticket_stats"),
+                category_distribution.scalar_subquery().label("category_distribution"),
+                agent_performance.scalar_subquery().label("agent_performance"),
+                response_times.scalar_subquery().label("response_times"),
+                ticket_sources.scalar_subquery().label("ticket_sources"),
+                lifetime.scalar_subquery().label("lifetime")
+            )
+        )
+        return dict(result.mappings().one())
+
+    async def recount_organization_tickets(self, db: AsyncSession) -> None:
+        """Recompute the trigger-maintained ticket counters on every organization."""
+        counts = (
+            select(
+                Ticket.organization_id,
+                func.count().label("total"),
+                func.count().filter(
+                    Ticket.status.not_in(_RESOLVED_STATUSES)
+                ).label("open"),
+                func.max(Ticket.closed_at).label("last_closed_at")
+            )
+            .group_by(Ticket.organization_id)
+            .subquery()
+        )
+        # Organizations without tickets get no counts row; reset them to zero
+        totals = (
+            select(
+                Organization.id,
+                func.coalesce(counts.c.total, 0).label("total"),
+                func.coalesce(counts.c.open, 0).label("open"),
+                counts.c.last_closed_at
+            )
+            .outerjoin(counts, counts.c.organization_id == Organization.id)
+            .subquery()
+        )
+        await db.execute(
+            update(Organization)
+            .where(Organization.id == totals.c.id)
+            .values(
+                total_ticket_count=totals.c.total,
+                open_ticket_count=totals.c.open,
+                last_closed_at=totals.c.last_closed_at
+            )
+        )
+        await db.commit()
+
+    async def refresh_daily_view(self, db: AsyncSession) -> None:
+        """Rebuild ticket_analytics_daily without blocking readers."""
+        await db.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY ticket_analytics_daily")
+        )
+        await db.commit()
 
 analytics = CRUDAnalytics(TicketAnalytics)
\ No newline at end of file
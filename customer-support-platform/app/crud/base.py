@@ -1,7 +1,9 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, bindparam, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import logger
 
@@ -9,95 +11,134 @@ ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Position of the last row of a keyset page: (created_at, id)
+KeysetCursor = Tuple[datetime, Any]
+
+
+@lru_cache(maxsize=128)
+def _select_by_field(model: Type[Any], field: str) -> Select:
+    """Build the lookup statement for a model column once and reuse it."""
+    if field not in model.__table__.columns:
+        raise ValueError(f"{model.__name__} has no column {field!r}")
+    return select(model).where(getattr(model, field) == bindparam("value"))
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base class for CRUD operations on models."""
-    
+
     def __init__(self, model: Type[ModelType]):
         """Initialize with the SQLAlchemy model."""
         self.model = model
-        
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
+
+    def _keyset_after(self, after: KeysetCursor, descending: bool = True):
+        """Condition selecting rows past a cursor in (created_at, id) order."""
+        key = tuple_(self.model.created_at, self.model.id)
+        cursor = tuple_(*after)
+        return key < cursor if descending else key > cursor
+
+    @staticmethod
+    def _next_cursor(rows: Sequence[Any], limit: int) -> Optional[KeysetCursor]:
+        """Cursor for the page after ``rows``, or None on the last page."""
+        if len(rows) < limit:
+            return None
+        return rows[-1].created_at, rows[-1].id
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """Get a single record by ID."""
         try:
-            return db.query(self.model).filter(self.model.id == id).first()
+            return await db.get(self.model, id)
         except Exception as e:
             logger.error(f"Error getting {self.model.__name__} with id {id}: {str(e)}")
             raise
-    
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         """Get multiple records with pagination."""
         try:
-            return db.query(self.model).offset(skip).limit(limit).all()
+            result = await db.execute(select(self.model).offset(skip).limit(limit))
+            return result.scalars().all()
         except Exception as e:
             logger.error(f"Error getting multiple {self.model.__name__} records: {str(e)}")
             raise
-    
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        """Create a new record."""
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """Create a new record, reading it back from the INSERT's RETURNING clause."""
         try:
-            obj_in_data = jsonable_encoder(obj_in)
-            db_obj = self.model(**obj_in_data)
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            if isinstance(obj_in, BaseModel):
+                obj_in_data = obj_in.model_dump(mode="json")
+            else:
+                obj_in_data = dict(obj_in)
+            result = await db.execute(
+                insert(self.model).values(**obj_in_data).returning(self.model)
+            )
+            db_obj = result.scalar_one()
+            await db.commit()
             return db_obj
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error creating {self.model.__name__}: {str(e)}")
             raise
-    
-    def update(
-        self, 
-        db: Session, 
-        *, 
-        db_obj: ModelType, 
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        """Update a record."""
+        """Update a record, reading it back from the UPDATE's RETURNING clause."""
         try:
-            obj_data = jsonable_encoder(db_obj)
-            
             if isinstance(obj_in, dict):
                 update_data = obj_in
             else:
-                update_data = obj_in.dict(exclude_unset=True)
-            
-            for field in obj_data:
-                if field in update_data:
-                    setattr(db_obj, field, update_data[field])
-            
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+                update_data = obj_in.model_dump(exclude_unset=True)
+
+            columns = self.model.__table__.columns.keys()
+            values = {
+                field: value for field, value in update_data.items()
+                if field in columns
+            }
+            if not values:
+                return db_obj
+
+            result = await db.execute(
+                update(self.model)
+                .where(self.model.id == db_obj.id)
+                .values(**values)
+                .returning(self.model)
+            )
+            db_obj = result.scalar_one()
+            await db.commit()
             return db_obj
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error updating {self.model.__name__}: {str(e)}")
             raise
-    
-    def remove(self, db: Session, *, id: int) -> ModelType:
+
+    async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
         """Delete a record."""
         try:
-            obj = db.query(self.model).get(id)
+            obj = await self.get(db, id)
             if obj:
-                db.delete(obj)
-                db.commit()
+                await db.delete(obj)
+                await db.commit()
                 return obj
             return None
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error deleting {self.model.__name__} with id {id}: {str(e)}")
             raise
-    
-    def get_by_field(
-        self, db: Session, *, field: str, value: Any
+
+    async def get_by_field(
+        self, db: AsyncSession, *, field: str, value: Any
     ) -> Optional[ModelType]:
         """Get a record by a specific field."""
         try:
-            filter_condition = {field: value}
-            return db.query(self.model).filter_by(**filter_condition).first()
+            result = await db.execute(
+                _select_by_field(self.model, field), {"value": value}
+            )
+            return result.scalars().first()
         except Exception as e:
             logger.error(f"Error getting {self.model.__name__} by {field}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
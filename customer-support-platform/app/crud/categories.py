@@ -1,62 +1,66 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.category import Category as CategoryModel
 from app.schemas.categories import CategoryCreate, CategoryUpdate
 from .base import CRUDBase
 
 class CRUDCategory(CRUDBase[CategoryModel, CategoryCreate, CategoryUpdate]):
-    def get_by_name(
+    async def get_by_name(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         name: str, 
         organization_id: str
     ) -> Optional[CategoryModel]:
-        return (
-            db.query(CategoryModel)
-            .filter(
+        result = await db.execute(
+            select(CategoryModel).where(
                 CategoryModel.name == name,
                 CategoryModel.organization_id == organization_id
             )
-            .first()
         )
+        return result.scalars().first()
     
-    def get_multi_by_organization(
+    async def get_multi_by_organization(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         organization_id: str, 
         skip: int = 0, 
         limit: int = 100,
         is_active: Optional[bool] = None
     ) -> List[CategoryModel]:
-        query = db.query(CategoryModel).filter(
+        query = select(CategoryModel).where(
             CategoryModel.organization_id == organization_id
         )
         
         if is_active is not None:
-            query = query.filter(CategoryModel.is_active == is_active)
+            query = query.where(CategoryModel.is_active == is_active)
         
-        return (
+        result = await db.execute(
             query
             .order_by(CategoryModel.name.asc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
     
-    def update_status(
+    async def update_status(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         db_obj: CategoryModel, 
         is_active: bool
     ) -> CategoryModel:
-        db_obj.is_active = is_active
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        result = await db.execute(
+            update(CategoryModel)
+            .where(CategoryModel.id == db_obj.id)
+            .values(is_active=is_active)
+            .returning(CategoryModel)
+        )
+        db_obj = result.scalar_one()
+        await db.commit()
         return db_obj
 
 category = CRUDCategory(CategoryModel)
@@ -1,100 +1,110 @@
 from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.customer import Customer as CustomerModel
+from app.models.tickets import Customer as CustomerModel, Ticket
 from app.schemas.customer import CustomerCreate, CustomerUpdate
 from .base import CRUDBase
 
 class CRUDCustomer(CRUDBase[CustomerModel, CustomerCreate, CustomerUpdate]):
-    def get_by_email(
+    async def get_by_email(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         email: str, 
         organization_id: str
     ) -> Optional[CustomerModel]:
-        return (
-            db.query(CustomerModel)
-            .filter(
+        result = await db.execute(
+            select(CustomerModel)
+            .where(
                 CustomerModel.email == email,
                 CustomerModel.organization_id == organization_id
             )
-            .first()
         )
+        return result.scalars().first()
 
-    def get_by_channel_identifier(
+    async def get_by_channel_identifier(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         channel: str, 
         channel_identifier: str, 
         organization_id: str
     ) -> Optional[CustomerModel]:
-        return (
-            db.query(CustomerModel)
-            .filter(
+        result = await db.execute(
+            select(CustomerModel)
+            .where(
                 CustomerModel.channel == channel,
                 CustomerModel.channel_identifier == channel_identifier,
                 CustomerModel.organization_id == organization_id
             )
-            .first()
         )
+        return result.scalars().first()
 
-    def search(
+    async def search(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         search_term: str, 
         organization_id: str, 
         skip: int = 0, 
         limit: int = 100
     ) -> List[CustomerModel]:
-        return (
-            db.query(CustomerModel)
-            .filter(
+        # Substring match (served by the gin_trgm_ops indexes), closest first
+        pattern = f"%{search_term}%"
+        result = await db.execute(
+            select(CustomerModel)
+            .where(
                 CustomerModel.organization_id == organization_id,
                 or_(
-                    CustomerModel.email.ilike(f"%{search_term}%"),
-                    CustomerModel.name.ilike(f"%{search_term}%"),
-                    CustomerModel.phone.ilike(f"%{search_term}%")
+                    CustomerModel.email.ilike(pattern),
+                    CustomerModel.name.ilike(pattern),
+                    CustomerModel.phone.ilike(pattern)
                 )
             )
-            .order_by(CustomerModel.created_at.desc())
+            .order_by(
+                func.greatest(
+                    func.similarity(CustomerModel.name, search_term),
+                    func.similarity(CustomerModel.email, search_term),
+                    func.similarity(CustomerModel.phone, search_term)
+                ).desc(),
+                CustomerModel.created_at.desc()
+            )
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
     
-    def get_multi_by_organization(
+    async def get_multi_by_organization(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         organization_id: str, 
         skip: int = 0, 
         limit: int = 100
     ) -> List[CustomerModel]:
-        return (
-            db.query(CustomerModel)
-            .filter(CustomerModel.organization_id == organization_id)
+        result = await db.execute(
+            select(CustomerModel)
+            .where(CustomerModel.organization_id == organization_id)
             .order_by(CustomerModel.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
 
-    def get_tickets(
-        self, db: Session, *, customer_id: str, organization_id: str, skip: int = 0, limit: int = 100
-    ) -> List[Customer]:
-        customer = (
-            db.query(Customer)
-            .options(joinedload(Customer.tickets))
-            .filter(
-                Customer.id == customer_id,
-                Customer.organization_id == organization_id
+    async def get_tickets(
+        self, db: AsyncSession, *, customer_id: str, organization_id: str, skip: int = 0, limit: int = 100
+    ) -> List[Ticket]:
+        result = await db.execute(
+            select(Ticket)
+            .where(
+                Ticket.customer_id == customer_id,
+                Ticket.organization_id == organization_id
             )
-            .first()
+            .order_by(Ticket.created_at.desc())
+            .offset(skip)
+            .limit(limit)
         )
-        return customer.tickets[skip:skip + limit] if customer else []
+        return result.scalars().all()
 
-customer = CRUDCustomer(Customer)
+customer = CRUDCustomer(CustomerModel)
@@ -1,8 +1,10 @@
- from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.models.document_category import DocumentCategoryAssignment as DocumentCategoryAssignmentModel
+from app.models.documents import DocumentCategoryAssignment as DocumentCategoryAssignmentModel
 from app.schemas.document_category import (
     DocumentCategoryAssignmentCreate,
     DocumentCategoryAssignmentUpdate,
@@ -15,109 +17,130 @@ class CRUDDocumentCategory(CRUDBase[
     DocumentCategoryAssignmentCreate,
     DocumentCategoryAssignmentUpdate
 ]):
-    def get_by_document_and_category(
+    async def get_by_document_and_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         document_id: str,
         category_id: str
     ) -> Optional[DocumentCategoryAssignmentModel]:
-        return db.query(DocumentCategoryAssignmentModel).filter(
-            and_(
+        result = await db.execute(
+            select(DocumentCategoryAssignmentModel).where(and_(
                 DocumentCategoryAssignmentModel.document_id == document_id,
                 DocumentCategoryAssignmentModel.category_id == category_id
-            )
-        ).first()
+            ))
+        )
+        return result.scalars().first()
 
-    def get_multi_by_document(
+    async def get_multi_by_document(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         document_id: str,
         skip: int = 0,
         limit: int = 100
     ) -> List[DocumentCategoryAssignmentModel]:
-        return (
-            db.query(DocumentCategoryAssignmentModel)
-            .filter(DocumentCategoryAssignmentModel.document_id == document_id)
+        result = await db.execute(
+            select(DocumentCategoryAssignmentModel)
+            .where(DocumentCategoryAssignmentModel.document_id == document_id)
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
 
-    def get_multi_by_category(
+    async def get_multi_by_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         category_id: str,
         skip: int = 0,
         limit: int = 100
     ) -> List[DocumentCategoryAssignmentModel]:
-        return (
-            db.query(DocumentCategoryAssignmentModel)
-            .filter(DocumentCategoryAssignmentModel.category_id == category_id)
+        result = await db.execute(
+            select(DocumentCategoryAssignmentModel)
+            .where(DocumentCategoryAssignmentModel.category_id == category_id)
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
 
-    def create_with_document_and_category(
+    async def create_with_document_and_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         document_id: str,
         category_id: str
     ) -> DocumentCategoryAssignmentModel:
-        db_obj = DocumentCategoryAssignmentModel(
-            document_id=document_id,
-            category_id=category_id
+        result = await db.execute(
+            insert(DocumentCategoryAssignmentModel).values(
+                document_id=document_id,
+                category_id=category_id
+            ).returning(DocumentCategoryAssignmentModel)
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db_obj = result.scalar_one()
+        await db.commit()
         return db_obj
 
-    def remove_by_document_and_category(
+    async def bulk_create(
         self,
-        db: Session,
+        db: AsyncSession,
+        *,
+        pairs: List[Tuple[str, str]]
+    ) -> None:
+        """Assign many (document_id, category_id) pairs in one statement, skipping existing ones."""
+        if not pairs:
+            return
+        stmt = pg_insert(DocumentCategoryAssignmentModel).values([
+            {"document_id": document_id, "category_id": category_id}
+            for document_id, category_id in pairs
+        ]).on_conflict_do_nothing()
+        await db.execute(stmt)
+        await db.commit()
+
+    async def remove_by_document_and_category(
+        self,
+        db: AsyncSession,
         *,
         document_id: str,
         category_id: str
     ) -> Optional[DocumentCategoryAssignmentModel]:
-        obj = db.query(DocumentCategoryAssignmentModel).filter(
-            and_(
+        result = await db.execute(
+            delete(DocumentCategoryAssignmentModel).where(and_(
                 DocumentCategoryAssignmentModel.document_id == document_id,
                 DocumentCategoryAssignmentModel.category_id == category_id
-            )
-        ).first()
-        if obj:
-            db.delete(obj)
-            db.commit()
+            )).returning(DocumentCategoryAssignmentModel)
+        )
+        obj = result.scalars().first()
+        await db.commit()
         return obj
 
-    def remove_by_document(
+    async def remove_by_document(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         document_id: str
-    ) -> int:
-        result = db.query(DocumentCategoryAssignmentModel).filter(
+    ) -> List[UUID]:
+        """Delete matching assignments and return the removed IDs."""
+        result = await db.execute(delete(DocumentCategoryAssignmentModel).where(
             DocumentCategoryAssignmentModel.document_id == document_id
-        ).delete()
-        db.commit()
-        return result
+        ).returning(DocumentCategoryAssignmentModel.id))
+        ids = result.scalars().all()
+        await db.commit()
+        return ids
 
-    def remove_by_category(
+    async def remove_by_category(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         category_id: str
-    ) -> int:
-        result = db.query(DocumentCategoryAssignmentModel).filter(
+    ) -> List[UUID]:
+        """Delete matching assignments and return the removed IDs."""
+        result = await db.execute(delete(DocumentCategoryAssignmentModel).where(
             DocumentCategoryAssignmentModel.category_id == category_id
-        ).delete()
-        db.commit()
-        return result
+        ).returning(DocumentCategoryAssignmentModel.id))
+        ids = result.scalars().all()
+        await db.commit()
+        return ids
 
 
 document_category = CRUDDocumentCategory(DocumentCategoryAssignmentModel)
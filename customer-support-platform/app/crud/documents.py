@@ -1,13 +1,23 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import and_, func, insert, or_, select
 
-from app.models.document import Document as DocumentModel
+from app.models.documents import Document as DocumentModel
 from app.schemas.documents import (
     DocumentCreate,
     DocumentUpdate,
 )
-from .base import CRUDBase
+from app.core.redis import Counter
+from app.utils.constants import ORG_TOTALS_CACHE_PREFIX, ORG_TOTALS_CACHE_TIMEOUT
+from .base import CRUDBase, KeysetCursor
+
+# Shortest search word worth sending to the full-text index
+FULL_TEXT_MIN_WORD = 3
+
+
+def _docs_bytes_key(organization_id) -> str:
+    return f"{ORG_TOTALS_CACHE_PREFIX}{organization_id}:docs_bytes"
 
 
 class CRUDDocument(CRUDBase[DocumentModel, DocumentCreate, DocumentUpdate]):
@@ -45,11 +55,33 @@ class CRUDDocument(CRUDBase[DocumentModel, DocumentCreate, DocumentUpdate]):
             query = query.filter(DocumentModel.is_public == is_public)
 
         if search:
-            search_filter = or_(
-                DocumentModel.title.ilike(f'%{search}%'),
-                DocumentModel.content.ilike(f'%{search}%')
-                if DocumentModel.content else False
-            )
+            terms = search.split()
+            if any(len(term) >= FULL_TEXT_MIN_WORD for term in terms):
+                # Whole words go through the full-text index; every term
+                # fuzzily matching title or content also counts, so typos
+                # still hit via the trigram indexes
+                search_filter = or_(
+                    DocumentModel.search_vector.op('@@')(
+                        func.plainto_tsquery('english', search)
+                    ),
+                    and_(*[
+                        or_(
+                            DocumentModel.title.op('%>')(term),
+                            DocumentModel.content.op('%>')(term)
+                        )
+                        for term in terms
+                    ])
+                )
+            else:
+                # Short fragments fall back to trigram-backed substring
+                # match, requiring every fragment to appear
+                search_filter = and_(*[
+                    or_(
+                        DocumentModel.title.ilike(pattern),
+                        DocumentModel.content.ilike(pattern)
+                    )
+                    for pattern in (f'%{term}%' for term in terms)
+                ])
             query = query.filter(search_filter)
 
         return (
@@ -60,6 +92,30 @@ class CRUDDocument(CRUDBase[DocumentModel, DocumentCreate, DocumentUpdate]):
             .all()
         )
 
+    async def get_multi_by_organization_keyset(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: str,
+        after: Optional[KeysetCursor] = None,
+        limit: int = 100
+    ) -> Tuple[List[DocumentModel], Optional[KeysetCursor]]:
+        """Newest-first page of documents following the ``after`` cursor."""
+        stmt = select(DocumentModel).where(
+            DocumentModel.organization_id == organization_id
+        )
+        if after:
+            stmt = stmt.where(self._keyset_after(after))
+
+        stmt = (
+            stmt
+            .order_by(DocumentModel.created_at.desc(), DocumentModel.id.desc())
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        rows = result.scalars().all()
+        return rows, self._next_cursor(rows, limit)
+
     def get_multi_by_uploader(
         self,
         db: Session,
@@ -81,37 +137,45 @@ class CRUDDocument(CRUDBase[DocumentModel, DocumentCreate, DocumentUpdate]):
             .all()
         )
 
-    def create_with_uploader(
+    async def create_with_uploader(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         obj_in: DocumentCreate,
         uploaded_by: Optional[str] = None
     ) -> DocumentModel:
-        db_obj = DocumentModel(
+        stmt = insert(DocumentModel).values(
             **obj_in.dict(exclude_unset=True),
             uploaded_by=uploaded_by
-        )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        ).returning(DocumentModel)
+        db_obj = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+        await Counter.incr(_docs_bytes_key(db_obj.organization_id), db_obj.file_size or 0)
         return db_obj
 
-    def update_file_info(
+    async def update_file_info(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         db_obj: DocumentModel,
         file_path: str,
         file_size: int,
         mime_type: str
     ) -> DocumentModel:
+        size_change = (file_size or 0) - (db_obj.file_size or 0)
         db_obj.file_path = file_path
         db_obj.file_size = file_size
         db_obj.mime_type = mime_type
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        await Counter.incr(_docs_bytes_key(db_obj.organization_id), size_change)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: str) -> Optional[DocumentModel]:
+        db_obj = await super().remove(db, id=id)
+        if db_obj:
+            await Counter.incr(_docs_bytes_key(db_obj.organization_id), -(db_obj.file_size or 0))
         return db_obj
 
     def update_content(
@@ -139,19 +203,28 @@ class CRUDDocument(CRUDBase[DocumentModel, DocumentCreate, DocumentUpdate]):
         db.refresh(db_obj)
         return db_obj
 
-    def get_total_size_by_organization(
+    async def get_total_size_by_organization(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         organization_id: str
     ) -> int:
-        result = db.query(
-            db.func.coalesce(db.func.sum(DocumentModel.file_size), 0)
-        ).filter(
+        """Total stored bytes, served from a Redis counter kept current on writes."""
+        key = _docs_bytes_key(organization_id)
+        total = await Counter.get(key)
+        if total is not None:
+            return total
+
+        stmt = select(
+            func.coalesce(func.sum(DocumentModel.file_size), 0)
+        ).where(
             DocumentModel.organization_id == organization_id,
             DocumentModel.file_size.isnot(None)
-        ).scalar()
-        return int(result) if result is not None else 0
+        )
+        result = (await db.execute(stmt)).scalar()
+        total = int(result) if result is not None else 0
+        await Counter.seed(key, total, ORG_TOTALS_CACHE_TIMEOUT)
+        return total
 
 
 # Create a singleton instance
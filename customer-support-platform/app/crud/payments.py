@@ -1,48 +1,77 @@
+import calendar
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.models.payment import PaymentTransaction as PaymentTransactionModel
+from app.models.payments import PaymentTransaction as PaymentTransactionModel
 from app.schemas.payments import (
     PaymentTransactionCreate,
     PaymentTransactionUpdate,
 )
-from .base import CRUDBase
+from app.core.redis import Counter
+from app.utils.constants import ORG_TOTALS_CACHE_PREFIX, ORG_TOTALS_CACHE_TIMEOUT
+from .base import CRUDBase, KeysetCursor
+
+
+def _paid_key(organization_id, month: Optional[date] = None) -> str:
+    """Counter of captured amounts in paise, all-time or for one month."""
+    key = f"{ORG_TOTALS_CACHE_PREFIX}{organization_id}:paid"
+    return f"{key}:{month:%Y-%m}" if month else key
+
+
+def _paid_counter_key(
+    organization_id, start_date: Optional[date], end_date: Optional[date]
+) -> Optional[str]:
+    """The counter matching a date range, if the range is all-time or one calendar month."""
+    if start_date is None and end_date is None:
+        return _paid_key(organization_id)
+    if (
+        start_date and end_date
+        and start_date.day == 1
+        and end_date.replace(day=1) == start_date
+        and end_date.day == calendar.monthrange(end_date.year, end_date.month)[1]
+    ):
+        return _paid_key(organization_id, start_date)
+    return None
 
 
 class CRUDPayment(CRUDBase[PaymentTransactionModel, PaymentTransactionCreate, PaymentTransactionUpdate]):
-    def get_by_razorpay_id(
+    async def get_by_razorpay_id(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         razorpay_payment_id: str,
         organization_id: Optional[str] = None
     ) -> Optional[PaymentTransactionModel]:
-        query = db.query(PaymentTransactionModel).filter(
+        stmt = select(PaymentTransactionModel).where(
             PaymentTransactionModel.razorpay_payment_id == razorpay_payment_id
         )
         if organization_id:
-            query = query.filter(PaymentTransactionModel.organization_id == organization_id)
-        return query.first()
+            stmt = stmt.where(PaymentTransactionModel.organization_id == organization_id)
+        result = await db.execute(stmt)
+        return result.scalars().first()
 
-    def get_by_order_id(
+    async def get_by_order_id(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         razorpay_order_id: str,
         organization_id: Optional[str] = None
     ) -> Optional[PaymentTransactionModel]:
-        query = db.query(PaymentTransactionModel).filter(
+        stmt = select(PaymentTransactionModel).where(
             PaymentTransactionModel.razorpay_order_id == razorpay_order_id
         )
         if organization_id:
-            query = query.filter(PaymentTransactionModel.organization_id == organization_id)
-        return query.first()
+            stmt = stmt.where(PaymentTransactionModel.organization_id == organization_id)
+        result = await db.execute(stmt)
+        return result.scalars().first()
 
-    def get_multi_by_organization(
+    async def get_multi_by_organization(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         organization_id: str,
         skip: int = 0,
@@ -51,17 +80,19 @@ class CRUDPayment(CRUDBase[PaymentTransactionModel, PaymentTransactionCreate, Pa
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
     ) -> List[PaymentTransactionModel]:
-        query = db.query(PaymentTransactionModel).filter(
+        stmt = select(PaymentTransactionModel).options(
+            selectinload(PaymentTransactionModel.organization)
+        ).where(
             PaymentTransactionModel.organization_id == organization_id
         )
 
         if status:
-            query = query.filter(
+            stmt = stmt.where(
                 PaymentTransactionModel.status == status.lower()
             )
 
         if start_date:
-            query = query.filter(
+            stmt = stmt.where(
                 PaymentTransactionModel.created_at >= start_date
             )
 
@@ -70,28 +101,58 @@ class CRUDPayment(CRUDBase[PaymentTransactionModel, PaymentTransactionCreate, Pa
             next_day = datetime.combine(
                 end_date, datetime.min.time()
             ) + timedelta(days=1)
-            query = query.filter(
+            stmt = stmt.where(
                 PaymentTransactionModel.created_at < next_day
             )
 
-        return (
-            query
+        stmt = (
+            stmt
             .order_by(PaymentTransactionModel.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        result = await db.execute(stmt)
+        return result.scalars().all()
 
-    def update_status(
+    async def get_multi_by_organization_keyset(
         self,
-        db: Session,
+        db: AsyncSession,
+        *,
+        organization_id: str,
+        after: Optional[KeysetCursor] = None,
+        limit: int = 100
+    ) -> Tuple[List[PaymentTransactionModel], Optional[KeysetCursor]]:
+        """Newest-first page of payments following the ``after`` cursor."""
+        stmt = select(PaymentTransactionModel).where(
+            PaymentTransactionModel.organization_id == organization_id
+        )
+        if after:
+            stmt = stmt.where(self._keyset_after(after))
+
+        stmt = (
+            stmt
+            .order_by(
+                PaymentTransactionModel.created_at.desc(),
+                PaymentTransactionModel.id.desc()
+            )
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        rows = result.scalars().all()
+        return rows, self._next_cursor(rows, limit)
+
+    async def update_status(
+        self,
+        db: AsyncSession,
         *,
         db_obj: PaymentTransactionModel,
         status: str,
         razorpay_payment_id: Optional[str] = None,
         update_data: Optional[Dict[str, Any]] = None
     ) -> PaymentTransactionModel:
+        was_captured = db_obj.status == 'captured'
         db_obj.status = status.lower()
+        is_captured = db_obj.status == 'captured'
         
         if razorpay_payment_id:
             db_obj.razorpay_payment_id = razorpay_payment_id
@@ -101,39 +162,59 @@ class CRUDPayment(CRUDBase[PaymentTransactionModel, PaymentTransactionCreate, Pa
                 setattr(db_obj, field, value)
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+
+        # Moves into 'captured' add to the paid totals, moves out (refunds,
+        # failures after capture) take the amount back off
+        if is_captured != was_captured:
+            paise = int(db_obj.amount * 100) * (1 if is_captured else -1)
+            await Counter.incr(_paid_key(db_obj.organization_id), paise)
+            await Counter.incr(_paid_key(db_obj.organization_id, db_obj.created_at), paise)
         return db_obj
     
-    def get_total_paid_amount(
+    async def get_total_paid_amount(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         organization_id: str,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
     ) -> Decimal:
-        query = db.query(PaymentTransactionModel).filter(
+        """
+        Sum of captured payments. All-time and whole-month totals come from
+        Redis counters kept current by update_status; other ranges hit SQL.
+        """
+        key = _paid_counter_key(organization_id, start_date, end_date)
+        if key:
+            paise = await Counter.get(key)
+            if paise is not None:
+                return Decimal(paise) / 100
+
+        stmt = select(
+            func.coalesce(func.sum(PaymentTransactionModel.amount), Decimal('0'))
+        ).where(
             PaymentTransactionModel.organization_id == organization_id,
             PaymentTransactionModel.status == 'captured'
         )
         
         if start_date:
-            query = query.filter(PaymentTransactionModel.created_at >= start_date)
+            stmt = stmt.where(PaymentTransactionModel.created_at >= start_date)
             
         if end_date:
             next_day = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
-            query = query.filter(PaymentTransactionModel.created_at < next_day)
-        
-        result = query.with_entities(
-            db.func.coalesce(db.func.sum(PaymentTransactionModel.amount), Decimal('0'))
-        ).scalar()
+            stmt = stmt.where(PaymentTransactionModel.created_at < next_day)
         
-        return result if result is not None else Decimal('0')
+        result = (await db.execute(stmt)).scalar()
+        total = result if result is not None else Decimal('0')
+
+        if key:
+            await Counter.seed(key, int(total * 100), ORG_TOTALS_CACHE_TIMEOUT)
+        return total
     
-    def has_active_subscription(
+    async def has_active_subscription(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         organization_id: str,
         current_date: Optional[date] = None
@@ -141,16 +222,16 @@ class CRUDPayment(CRUDBase[PaymentTransactionModel, PaymentTransactionCreate, Pa
         if current_date is None:
             current_date = date.today()
             
-        return db.query(
-            db.query(PaymentTransactionModel)
-            .filter(
+        stmt = select(
+            exists().where(
                 PaymentTransactionModel.organization_id == organization_id,
                 PaymentTransactionModel.status == 'captured',
                 PaymentTransactionModel.billing_period_start <= current_date,
                 PaymentTransactionModel.billing_period_end >= current_date
             )
-            .exists()
-        ).scalar()
+        )
+        result = await db.execute(stmt)
+        return result.scalar()
 
 
 # Create a singleton instance
@@ -1,11 +1,21 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, or_
+from pydantic import BaseModel
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import Text, cast, desc, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.ticket_message import TicketMessage as TicketMessageModel
+from app.models.tickets import Ticket, TicketMessage as TicketMessageModel
 from app.schemas.ticket_message import TicketMessageCreate, TicketMessageUpdate
-from .base import CRUDBase
+from .base import CRUDBase, KeysetCursor
+
+
+def _in_organization(organization_id: str):
+    """Messages carry no organization; scope them through their ticket."""
+    return TicketMessageModel.ticket_id.in_(
+        select(Ticket.id).where(Ticket.organization_id == organization_id)
+    )
 
 
 class CRUDTicketMessage(CRUDBase[TicketMessageModel, TicketMessageCreate, TicketMessageUpdate]):
@@ -20,7 +30,8 @@ class CRUDTicketMessage(CRUDBase[TicketMessageModel, TicketMessageCreate, Ticket
             db.query(TicketMessageModel)
             .options(
                 joinedload(TicketMessageModel.ticket),
-                joinedload(TicketMessageModel.sender)
+                joinedload(TicketMessageModel.sender),
+                raiseload('*')
             )
             .filter(
                 TicketMessageModel.id == message_id,
@@ -55,6 +66,35 @@ class CRUDTicketMessage(CRUDBase[TicketMessageModel, TicketMessageCreate, Ticket
             .all()
         )
     
+    async def get_multi_by_ticket_keyset(
+        self,
+        db: AsyncSession,
+        *,
+        ticket_id: str,
+        organization_id: str,
+        after: Optional[KeysetCursor] = None,
+        limit: int = 100,
+        include_internal: bool = False
+    ) -> Tuple[List[TicketMessageModel], Optional[KeysetCursor]]:
+        """Oldest-first page of a ticket's messages following the ``after`` cursor."""
+        stmt = select(TicketMessageModel).where(
+            TicketMessageModel.ticket_id == ticket_id,
+            _in_organization(organization_id)
+        )
+        if not include_internal:
+            stmt = stmt.where(TicketMessageModel.is_internal == False)  # noqa: E712
+        if after:
+            stmt = stmt.where(self._keyset_after(after, descending=False))
+
+        stmt = (
+            stmt
+            .order_by(TicketMessageModel.created_at.asc(), TicketMessageModel.id.asc())
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        rows = result.scalars().all()
+        return rows, self._next_cursor(rows, limit)
+    
     def get_multi_by_sender(
         self,
         db: Session,
@@ -76,65 +116,136 @@ class CRUDTicketMessage(CRUDBase[TicketMessageModel, TicketMessageCreate, Ticket
             .all()
         )
     
-    def create_with_sender(
+    async def create_with_sender(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
-        obj_in: TicketMessageCreate,
+        obj_in: Union[TicketMessageCreate, Dict[str, Any]],
         ticket_id: str,
         sender_id: str,
-        organization_id: str,
         is_internal: bool = False
     ) -> TicketMessageModel:
-        db_obj = TicketMessageModel(
-            **obj_in.dict(),
-            ticket_id=ticket_id,
-            sender_id=sender_id,
-            organization_id=organization_id,
-            is_internal=is_internal
+        data = obj_in.model_dump() if isinstance(obj_in, BaseModel) else dict(obj_in)
+        data.update(ticket_id=ticket_id, sender_id=sender_id, is_internal=is_internal)
+        result = await db.execute(
+            insert(TicketMessageModel).values(**data).returning(TicketMessageModel)
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db_obj = result.scalar_one()
+        await db.commit()
         return db_obj
     
-    def mark_as_read(
+    async def create_multi_with_sender(
         self,
-        db: Session,
+        db: AsyncSession,
+        *,
+        rows: Sequence[Dict[str, Any]]
+    ) -> List[TicketMessageModel]:
+        """
+        Insert several messages in one statement.
+
+        Each row is a dict of TicketMessage columns: ticket_id, sender_type,
+        sender_id, message_content and optionally is_internal. Keys that are
+        not columns raise ValueError. The rows are sent as one executemany
+        batch, which SQLAlchemy renders as multi-row VALUES, so the
+        round-trips do not grow with the number of messages.
+        """
+        if not rows:
+            return []
+        columns = TicketMessageModel.__table__.columns.keys()
+        unknown = {key for row in rows for key in row} - set(columns)
+        if unknown:
+            raise ValueError(f"Unknown TicketMessage columns: {', '.join(sorted(unknown))}")
+        result = await db.scalars(
+            insert(TicketMessageModel).returning(TicketMessageModel),
+            list(rows)
+        )
+        messages = list(result.all())
+        await db.commit()
+        return messages
+
+    async def mark_as_read(
+        self,
+        db: AsyncSession,
         *,
         db_obj: TicketMessageModel,
         user_id: str
     ) -> TicketMessageModel:
-        if not db_obj.read_by:
-            db_obj.read_by = {}
-        
-        db_obj.read_by[str(user_id)] = datetime.utcnow().isoformat()
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        # Let Postgres set the single key instead of rewriting the whole map
+        result = await db.execute(
+            update(TicketMessageModel)
+            .where(TicketMessageModel.id == db_obj.id)
+            .values(
+                read_by=func.jsonb_set(
+                    func.coalesce(TicketMessageModel.read_by, cast({}, JSONB)),
+                    array([str(user_id)]),
+                    func.to_jsonb(cast(datetime.utcnow().isoformat(), Text)),
+                    True
+                )
+            )
+            .returning(TicketMessageModel)
+        )
+        db_obj = result.scalar_one()
+        await db.commit()
         return db_obj
     
-    def get_unread_count(
+    async def mark_ticket_read(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         ticket_id: str,
         user_id: str,
         organization_id: str
     ) -> int:
-        return (
-            db.query(TicketMessageModel)
-            .filter(
+        """Mark every unread message in a ticket as read by a user in one UPDATE."""
+        user_key = str(user_id)
+        result = await db.execute(
+            update(TicketMessageModel)
+            .where(
                 TicketMessageModel.ticket_id == ticket_id,
-                TicketMessageModel.organization_id == organization_id,
+                _in_organization(organization_id),
+                TicketMessageModel.sender_id != user_key,
                 or_(
                     TicketMessageModel.read_by == None,  # noqa: E711
-                    ~TicketMessageModel.read_by.has_key(str(user_id))  # type: ignore
-                ),
-                TicketMessageModel.sender_id != str(user_id)
+                    ~TicketMessageModel.read_by.has_key(user_key)  # type: ignore
+                )
             )
-            .count()
+            .values(
+                read_by=func.coalesce(
+                    TicketMessageModel.read_by, cast({}, JSONB)
+                ).op('||')(
+                    func.jsonb_build_object(user_key, datetime.utcnow().isoformat())
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+    
+    async def get_unread_count(
+        self,
+        db: AsyncSession,
+        *,
+        ticket_id: str,
+        user_id: str,
+        organization_id: str
+    ) -> int:
+        user_key = str(user_id)
+        conditions = (
+            TicketMessageModel.ticket_id == ticket_id,
+            _in_organization(organization_id),
+            TicketMessageModel.sender_id != user_key
+        )
+        # NOT (read_by ? :uid) cannot use an index, so count everything and
+        # subtract the messages the GIN index reports as already read
+        total = select(func.count(TicketMessageModel.id)).where(*conditions)
+        read = select(func.count(TicketMessageModel.id)).where(
+            *conditions,
+            TicketMessageModel.read_by.has_key(user_key)  # type: ignore
+        )
+        result = await db.execute(
+            select(total.scalar_subquery() - read.scalar_subquery())
         )
+        return result.scalar()
 
 ticket_message = CRUDTicketMessage(TicketMessageModel)
 
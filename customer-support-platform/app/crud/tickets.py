@@ -1,13 +1,27 @@
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from typing import Any, List, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.ticket import Ticket as TicketModel
+from app.models.tickets import Ticket as TicketModel, TicketMessage
 from app.schemas.tickets import TicketCreate, TicketUpdate
-from .base import CRUDBase
+from .base import CRUDBase, KeysetCursor
 
 class CRUDTicket(CRUDBase[TicketModel, TicketCreate, TicketUpdate]):
+    async def get_with_relations(
+        self, db: AsyncSession, *, id: Any
+    ) -> Optional[TicketModel]:
+        """Get a ticket with its customer and category loaded for detail views."""
+        return await db.get(
+            TicketModel,
+            id,
+            options=[
+                selectinload(TicketModel.customer),
+                selectinload(TicketModel.category)
+            ]
+        )
+
     def get_with_details(
         self, 
         db: Session, 
@@ -21,7 +35,8 @@ class CRUDTicket(CRUDBase[TicketModel, TicketCreate, TicketUpdate]):
                 joinedload(TicketModel.customer),
                 joinedload(TicketModel.assigned_agent),
                 joinedload(TicketModel.category),
-                joinedload(TicketModel.messages)
+                selectinload(TicketModel.messages),
+                raiseload('*')
             )
             .filter(
                 TicketModel.id == ticket_id,
@@ -44,6 +59,10 @@ class CRUDTicket(CRUDBase[TicketModel, TicketCreate, TicketUpdate]):
     ) -> List[TicketModel]:
         query = db.query(TicketModel).filter(
             TicketModel.organization_id == organization_id
+        ).options(
+            selectinload(TicketModel.customer),
+            selectinload(TicketModel.assigned_agent),
+            selectinload(TicketModel.category)
         )
         
         if status:
@@ -63,6 +82,60 @@ class CRUDTicket(CRUDBase[TicketModel, TicketCreate, TicketUpdate]):
             .all()
         )
     
+    async def get_multi_by_organization_with_counts(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: str,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Tuple[TicketModel, int]]:
+        """Newest-first tickets paired with their message counts."""
+        message_count = (
+            select(func.count(TicketMessage.id))
+            .where(TicketMessage.ticket_id == TicketModel.id)
+            .correlate(TicketModel)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(TicketModel, message_count)
+            .options(
+                selectinload(TicketModel.customer),
+                selectinload(TicketModel.assigned_agent),
+                selectinload(TicketModel.category)
+            )
+            .where(TicketModel.organization_id == organization_id)
+            .order_by(TicketModel.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return [(ticket, count) for ticket, count in result.all()]
+
+    async def get_multi_by_organization_keyset(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: str,
+        after: Optional[KeysetCursor] = None,
+        limit: int = 100
+    ) -> Tuple[List[TicketModel], Optional[KeysetCursor]]:
+        """Newest-first page of tickets following the ``after`` cursor."""
+        stmt = select(TicketModel).where(
+            TicketModel.organization_id == organization_id
+        )
+        if after:
+            stmt = stmt.where(self._keyset_after(after))
+
+        stmt = (
+            stmt
+            .order_by(TicketModel.created_at.desc(), TicketModel.id.desc())
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        rows = result.scalars().all()
+        return rows, self._next_cursor(rows, limit)
+
     def get_multi_by_agent(
         self, 
         db: Session, 
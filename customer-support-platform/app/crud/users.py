@@ -1,34 +1,85 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional, List, Tuple, Union
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.categories import UserCategoryAssignment
 from app.models.user import User as UserModel
 from app.schemas.users import UserCreate, UserUpdate
+from app.core.redis import Cache, redis
+from app.utils.cache import clear_request_cache, request_cached
+from app.utils.constants import (
+    ACTIVE_AGENTS_CACHE_PREFIX,
+    ACTIVE_AGENTS_CACHE_TIMEOUT,
+    ACTIVE_AGENTS_RR_TIMEOUT,
+    ROLE_INVALIDATION_CHANNEL,
+)
 from .base import CRUDBase
 
+
+def _active_agents_key(organization_id: Any) -> str:
+    return f"{ACTIVE_AGENTS_CACHE_PREFIX}{organization_id}"
+
+
 class CRUDUser(CRUDBase[UserModel, UserCreate, UserUpdate]):
-    def get_by_email(self, db: Session, *, email: str) -> Optional[UserModel]:
-        return db.query(UserModel).filter(UserModel.email == email).first()
+    @request_cached
+    async def get_by_id(self, db: AsyncSession, *, id: Any) -> Optional[UserModel]:
+        return await self.get(db, id)
+
+    @request_cached
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[UserModel]:
+        result = await db.execute(select(UserModel).where(UserModel.email == email))
+        return result.scalars().first()
     
-    def get_by_keycloak_id(self, db: Session, *, keycloak_user_id: str) -> Optional[UserModel]:
-        return db.query(UserModel).filter(UserModel.keycloak_user_id == keycloak_user_id).first()
+    @request_cached
+    async def get_by_keycloak_id(self, db: AsyncSession, *, keycloak_user_id: str) -> Optional[UserModel]:
+        result = await db.execute(
+            select(UserModel).where(UserModel.keycloak_user_id == keycloak_user_id)
+        )
+        return result.scalars().first()
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: UserModel,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> UserModel:
+        clear_request_cache()
+        await Cache.delete(_active_agents_key(db_obj.organization_id))
+        changed = obj_in.keys() if isinstance(obj_in, dict) else obj_in.model_fields_set
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        if changed & {"role", "is_active", "status"}:
+            # Evict this user from every instance's RoleGuard cache
+            await redis.publish(ROLE_INVALIDATION_CHANNEL, str(user.id))
+        return user
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[UserModel]:
+        clear_request_cache()
+        user = await super().remove(db, id=id)
+        if user:
+            await Cache.delete(_active_agents_key(user.organization_id))
+            # A deleted user must lose access on every instance immediately
+            await redis.publish(ROLE_INVALIDATION_CHANNEL, str(id))
+        return user
     
-    def get_multi_by_organization(
-        self, db: Session, *, organization_id: str, skip: int = 0, limit: int = 100
+    async def get_multi_by_organization(
+        self, db: AsyncSession, *, organization_id: str, skip: int = 0, limit: int = 100
     ) -> List[UserModel]:
-        return (
-            db.query(UserModel)
-            .filter(UserModel.organization_id == organization_id)
+        stmt = (
+            select(UserModel)
+            .where(UserModel.organization_id == organization_id)
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        result = await db.execute(stmt)
+        return result.scalars().all()
     
-    def get_multi_active_agents(
-        self, db: Session, *, organization_id: str, skip: int = 0, limit: int = 100
+    async def get_multi_active_agents(
+        self, db: AsyncSession, *, organization_id: str, skip: int = 0, limit: int = 100
     ) -> List[UserModel]:
-        return (
-            db.query(UserModel)
-            .filter(
+        stmt = (
+            select(UserModel)
+            .where(
                 UserModel.organization_id == organization_id,
                 UserModel.role == 'agent',
                 UserModel.is_active == True,  # noqa: E712
@@ -37,20 +88,93 @@ class CRUDUser(CRUDBase[UserModel, UserCreate, UserUpdate]):
             .order_by(UserModel.last_assigned_at.asc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        result = await db.execute(stmt)
+        return result.scalars().all()
     
-    def update_last_assigned(self, db: Session, *, db_obj: UserModel) -> UserModel:
-        from sqlalchemy import func
-        db_obj.last_assigned_at = func.now()
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+    async def get_active_agent_ids(
+        self, db: AsyncSession, *, organization_id: str
+    ) -> List[Tuple[str, Optional[str], List[str]]]:
+        """
+        Active agents as (user_id, last_assigned_at, category_ids) triples,
+        least recently assigned first. Cached in Redis briefly since
+        assignment paths ask for this on every ticket.
+        """
+        key = _active_agents_key(organization_id)
+        cached = await Cache.get(key)
+        if cached is not None:
+            return [tuple(agent) for agent in cached]
+
+        category_ids = func.array_remove(
+            func.array_agg(UserCategoryAssignment.category_id), None
+        )
+        result = await db.execute(
+            select(UserModel.id, UserModel.last_assigned_at, category_ids)
+            .outerjoin(
+                UserCategoryAssignment,
+                UserCategoryAssignment.user_id == UserModel.id
+            )
+            .where(
+                UserModel.organization_id == organization_id,
+                UserModel.role == 'agent',
+                UserModel.is_active.is_(True),
+                UserModel.status == 'active'
+            )
+            .group_by(UserModel.id, UserModel.last_assigned_at)
+            .order_by(UserModel.last_assigned_at.asc())
+        )
+        agents = [
+            (
+                str(agent_id),
+                last_assigned.isoformat() if last_assigned else None,
+                [str(category_id) for category_id in categories]
+            )
+            for agent_id, last_assigned, categories in result.all()
+        ]
+        await Cache.set(key, agents, expire=ACTIVE_AGENTS_CACHE_TIMEOUT)
+        return agents
+
+    async def next_active_agent_id(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: str,
+        category_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Pick the next active agent round-robin using a shared Redis counter,
+        limited to agents assigned to ``category_id`` when one is given.
+        """
+        agents = await self.get_active_agent_ids(db, organization_id=organization_id)
+        if category_id:
+            agents = [agent for agent in agents if str(category_id) in agent[2]]
+        if not agents:
+            return None
+
+        rr_key = f"{_active_agents_key(organization_id)}:rr"
+        async with Cache.pipeline() as pipe:
+            pipe.incr(rr_key)
+            pipe.expire(rr_key, ACTIVE_AGENTS_RR_TIMEOUT)
+            position, _ = await pipe.execute()
+        return agents[(position - 1) % len(agents)][0]
+
+    async def update_last_assigned(self, db: AsyncSession, *, user_id: Any) -> None:
+        """
+        Stamp an agent's last assignment time. The cached rotation is left
+        alone: the Redis pointer already moves past this agent, and the
+        order is refreshed when the cache expires.
+        """
+        clear_request_cache()
+        await db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(last_assigned_at=func.now())
+        )
+        await db.commit()
         
-    def count_by_role(
+    async def count_by_role(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         organization_id: str, 
         role: str,
         exclude_user_id: Optional[str] = None
@@ -67,15 +191,16 @@ class CRUDUser(CRUDBase[UserModel, UserCreate, UserUpdate]):
         Returns:
             int: Count of users matching the criteria
         """
-        query = db.query(UserModel).filter(
+        query = select(func.count(UserModel.id)).where(
             UserModel.organization_id == organization_id,
             UserModel.role == role,
-            UserModel.is_active == True  # noqa: E712
+            UserModel.is_active.is_(True)
         )
         
         if exclude_user_id:
-            query = query.filter(UserModel.id != exclude_user_id)
+            query = query.where(UserModel.id != exclude_user_id)
             
-        return query.count()
+        result = await db.execute(query)
+        return result.scalar_one()
 
 user = CRUDUser(UserModel)
@@ -1,21 +1,87 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.crud.users import user_crud
+from app.core.database import get_db
+from app.core.redis import redis
 from app.core.security import decode_jwt
-from typing import List
+from app.utils.constants import ROLE_INVALIDATION_CHANNEL
+from typing import List, Optional, Tuple
+
+@dataclass(frozen=True)
+class GuardUser:
+    """The fields RoleGuard checks, detached from any ORM session."""
+    id: UUID
+    role: str
+    organization_id: UUID
+    is_active: bool
+    status: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "GuardUser":
+        return cls(
+            id=user.id,
+            role=user.role,
+            organization_id=user.organization_id,
+            is_active=user.is_active,
+            status=user.status
+        )
+
+
+# Users resolved from a bearer token, keyed by a digest of the token so hot
+# tokens skip both JWT verification and the user lookup. Each entry holds the
+# token's exp claim and is ignored once that has passed.
+_guard_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+async def listen_for_role_changes() -> None:
+    """Drop cached users whose role or status changed on any instance."""
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(ROLE_INVALIDATION_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            user_id = message["data"].decode()
+            for digest, (user, _) in list(_guard_cache.items()):
+                if str(user.id) == user_id:
+                    _guard_cache.pop(digest, None)
+    finally:
+        await pubsub.unsubscribe(ROLE_INVALIDATION_CHANNEL)
+        await pubsub.close()
+
 
 class RoleGuard:
     """Role-based access dependency for FastAPI routes."""
     def __init__(self, allowed_roles: List[str]):
         self.allowed_roles = allowed_roles
 
-    async def __call__(self, credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer())):
+    async def __call__(
+        self,
+        credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+        db: AsyncSession = Depends(get_db)
+    ):
         token = credentials.credentials
-        payload = decode_jwt(token)
-        user_id = payload.get('sub')
-        user = user_crud.get_by_id(user_id)
-        if not user or user.role not in self.allowed_roles:
+        digest = _token_digest(token)
+        cached: Optional[Tuple[GuardUser, float]] = _guard_cache.get(digest)
+        if cached and cached[1] > time.time():
+            user = cached[0]
+        else:
+            payload = decode_jwt(token)
+            user_id = payload.get('sub')
+            db_user = await user_crud.get_by_id(db, id=user_id)
+            user = GuardUser.from_user(db_user) if db_user else None
+            if user:
+                _guard_cache[digest] = (user, payload.get('exp', 0))
+        if not user or not user.is_active or user.role not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions"
@@ -1,10 +1,10 @@
 import os
 import sys
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 import hvac
 
 # Sensitive keys that should be stored in Vault
-SENSITIVE_KEYS = {
+SENSITIVE_KEYS = frozenset({
     'SECRET_KEY', 'ACCESS_TOKEN_EXPIRE_MINUTES', 'ALGORITHM',
     'POSTGRES_USER', 'POSTGRES_PASSWORD', 'POSTGRES_DB',
     'REDIS_PASSWORD', 'RABBITMQ_USER', 'RABBITMQ_PASSWORD',
@@ -14,7 +14,7 @@ SENSITIVE_KEYS = {
     'TELEGRAM_BOT_TOKEN', 'RAZORPAY_KEY_ID', 'RAZORPAY_KEY_SECRET',
     'MINIO_ACCESS_KEY', 'MINIO_SECRET_KEY', 'SENTRY_DSN',
     'PGLADMIN_DEFAULT_PASSWORD', 'FLOWER_PASSWORD'
-}
+})
 
 def get_vault_client():
     """Initialize Vault client."""
@@ -28,24 +28,22 @@ def get_vault_client():
     
     return client
 
-def get_secrets_from_env():
-    """Extract sensitive environment variables."""
-    secrets = {}
-    
+def get_secrets_from_env(env):
+    """Extract sensitive variables from the parsed .env values."""
     # Get only explicitly defined sensitive keys
-    for key in SENSITIVE_KEYS:
-        value = os.getenv(key)
-        if value and value.strip():
-            secrets[key] = value
-    
-    return secrets
+    return {
+        key: env[key]
+        for key in SENSITIVE_KEYS & env.keys()
+        if env[key] and env[key].strip()
+    }
 
 def main():
     print("Vault Secrets Injection")
     print("-" * 30)
     
     # Load .env file
-    if not load_dotenv():
+    env = dotenv_values()
+    if not env:
         print("Error: Could not load .env file")
         return False
     
@@ -57,7 +55,7 @@ def main():
         print("Connected to Vault")
         
         # Get secrets
-        secrets = get_secrets_from_env()
+        secrets = get_secrets_from_env(env)
         if not secrets:
             print("Warning: No secrets found")
             return False
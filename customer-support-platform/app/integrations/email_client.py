@@ -1,14 +1,24 @@
 """Email client for sending and polling emails."""
+import aioimaplib
 import aiosmtplib
+import asyncio
+import contextlib
+import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from io import BytesIO
 import imaplib
 import email
+import shutil
+import tempfile
 from datetime import datetime
 from fastapi import HTTPException, status
 
 from app.config import settings
+from app.core.redis import redis
+from app.utils.constants import EMAIL_UID_CLAIM_PREFIX, EMAIL_UID_CLAIM_TIMEOUT
+
 
 class EmailClient:
     """Async email client for sending and receiving emails."""
@@ -61,37 +71,74 @@ class EmailClient:
             )
 
 
+    async def _connect(self, folder: str) -> aioimaplib.IMAP4_SSL:
+        """Open an IMAP session with ``folder`` selected."""
+        client = aioimaplib.IMAP4_SSL(host=self.imap_host, port=self.imap_port)
+        await client.wait_hello_from_server()
+        await client.login(self.smtp_username, self.smtp_password)
+        await client.select(folder)
+        return client
+
+
+    async def _claim_uid(self, folder: str, uid: str) -> bool:
+        """Claim a UID for body fetching; False if an earlier poll already queued it."""
+        key = f"{EMAIL_UID_CLAIM_PREFIX}{self.imap_host}:{folder}:{uid}"
+        return bool(await redis.set(key, 1, nx=True, ex=EMAIL_UID_CLAIM_TIMEOUT))
+
+
     async def poll_emails(self, folder: str = "INBOX") -> List[Dict[str, Any]]:
-        """Poll emails from IMAP server."""
-        try:
-            # Connect to IMAP server
-            mail = imaplib.IMAP4_SSL(self.imap_host, self.imap_port)
-            mail.login(self.smtp_username, self.smtp_password)
-            mail.select(folder)
+        """
+        Poll unread email headers from the IMAP server.
 
-            # Search for all unread emails
-            _, message_numbers = mail.search(None, 'UNSEEN')
+        Each new message is handed to fetch_email_body_task, which fetches
+        the body and creates the ticket; the returned dicts carry headers only.
+        """
+        try:
+            client = await self._connect(folder)
+
+            # Search for all unread emails; UIDs stay valid across sessions,
+            # unlike sequence numbers, so the body task can use them later
+            response = await client.uid_search('UNSEEN')
+            # A message stays UNSEEN until its body task runs, so skip UIDs
+            # an earlier poll has already queued
+            message_uids = [
+                uid for uid in response.lines[0].split()
+                if await self._claim_uid(folder, uid.decode())
+            ]
+            loop = asyncio.get_running_loop()
+
+            # aioimaplib runs one command at a time per connection, so the
+            # header fetches are issued in sequence
             email_list = []
-
-            for num in message_numbers[0].split():
-                _, msg = mail.fetch(num, '(RFC822)')
-                email_body = msg[0][1]
-                email_message = email.message_from_bytes(email_body)
+            for uid in message_uids:
+                # Headers only; PEEK leaves \Seen alone until the body is fetched
+                response = await client.uid('fetch', uid.decode(), '(BODY.PEEK[HEADER] FLAGS)')
+                header, flags = self._split_fetch_response(response.lines)
+                email_message = await loop.run_in_executor(
+                    None, email.message_from_bytes, header
+                )
 
                 # Parse email
-                email_data = {
-                    'id': num.decode(),
+                email_list.append({
+                    'id': uid.decode(),
+                    'message_id': email_message['message-id'],
                     'from': email_message['from'],
                     'to': email_message['to'],
                     'subject': email_message['subject'],
                     'date': email_message['date'],
-                    'body': self._get_email_body(email_message),
-                    'attachments': self._get_attachments(email_message)
-                }
-                email_list.append(email_data)
+                    'flags': flags
+                })
+
+            await client.close()
+            await client.logout()
 
-            mail.close()
-            mail.logout()
+            # Body and attachments are retrieved, and the ticket created, by a worker
+            from app.tasks.email_tasks import fetch_email_body_task
+            for email_data in email_list:
+                fetch_email_body_task.delay(email_data['id'], folder, {
+                    'from': email_data['from'],
+                    'subject': email_data['subject']
+                })
 
             return email_list
         except Exception as e:
@@ -101,6 +148,63 @@ class EmailClient:
             )
 
 
+    @staticmethod
+    def _split_fetch_response(lines: List[Any]) -> Tuple[bytes, List[str]]:
+        """
+        Return the header literal and flags of a header FETCH response.
+
+        Literals arrive as bytearray lines; FLAGS may sit on the line before
+        or after the literal depending on the server.
+        """
+        header = b''
+        flags: List[str] = []
+        for line in lines:
+            if isinstance(line, bytearray):
+                header = header or bytes(line)
+            elif b'FLAGS (' in line:
+                flags = [flag.decode() for flag in imaplib.ParseFlags(bytes(line))]
+        return header, flags
+
+
+    async def fetch_email_body(self, uid: str, folder: str = "INBOX") -> Dict[str, Any]:
+        """Fetch the body and attachments of a message found by poll_emails, by UID."""
+        try:
+            client = await self._connect(folder)
+
+            # BODY[TEXT] lacks the MIME headers needed to split parts, so
+            # fetch just those alongside it; the non-PEEK fetch marks \Seen
+            response = await client.uid(
+                'fetch',
+                uid,
+                '(BODY.PEEK[HEADER.FIELDS (CONTENT-TYPE CONTENT-TRANSFER-ENCODING)] BODY[TEXT])'
+            )
+            raw = b''.join(line for line in response.lines if isinstance(line, bytearray))
+
+            await client.close()
+            await client.logout()
+
+            # MIME walking and attachment decoding are CPU bound
+            body, attachments = await asyncio.get_running_loop().run_in_executor(
+                None, self._parse_body, raw
+            )
+            return {
+                'id': uid,
+                'body': body,
+                'attachments': attachments
+            }
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to fetch email body: {str(e)}"
+            )
+
+
+    def _parse_body(self, raw: bytes) -> Tuple[str, List[Dict[str, Any]]]:
+        """Parse a fetched body into its text and attachments."""
+        email_message = email.message_from_bytes(raw)
+        return self._get_email_body(email_message), self._get_attachments(email_message)
+
+
     def _get_email_body(self, email_message: email.message.Message) -> str:
         """Extract email body from message."""
         body = ""
@@ -117,7 +221,7 @@ class EmailClient:
 
 
     def _get_attachments(self, email_message: email.message.Message) -> List[Dict[str, Any]]:
-        """Extract attachments from email message."""
+        """Extract attachments from email message into temporary files."""
         attachments = []
         for part in email_message.walk():
             if part.get_content_maintype() == 'multipart':
@@ -127,13 +231,23 @@ class EmailClient:
 
             filename = part.get_filename()
             if filename:
+                with tempfile.NamedTemporaryFile(delete=False) as fp:
+                    shutil.copyfileobj(BytesIO(part.get_payload(decode=True)), fp)
                 attachments.append({
                     'filename': filename,
-                    'content': part.get_payload(decode=True),
+                    'path': fp.name,
                     'content_type': part.get_content_type()
                 })
         return attachments
 
 
+    @staticmethod
+    def discard_attachments(attachments: List[Dict[str, Any]]) -> None:
+        """Delete the temporary files written by _get_attachments."""
+        for attachment in attachments:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(attachment['path'])
+
+
 # Initialize global email client
 email_client = EmailClient()
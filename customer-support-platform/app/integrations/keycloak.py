@@ -1,9 +1,14 @@
 """Keycloak integration for authentication and authorization."""
+import asyncio
 from typing import Optional, Dict, Any
+import time
 from fastapi_keycloak import FastAPIKeycloak, OIDCUser
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from jose import JWTError, jwt
 
 from app.config import settings
+from app.core.http import http_client
 
 # Initialize Keycloak client
 keycloak_client = FastAPIKeycloak(
@@ -15,6 +20,46 @@ keycloak_client = FastAPIKeycloak(
     callback_uri=f"{settings.SERVER_HOST}:{settings.SERVER_PORT}/auth/callback"
 )
 
+# Bounds blocking Keycloak SDK calls so a burst cannot take over the threadpool
+_kc_sem = asyncio.Semaphore(settings.KEYCLOAK_MAX_CONCURRENCY)
+
+
+async def _run_sdk(func, *args, **kwargs):
+    """Run a blocking Keycloak SDK call on the threadpool within the concurrency budget."""
+    async with _kc_sem:
+        return await run_in_threadpool(func, *args, **kwargs)
+
+
+KEYCLOAK_ISSUER = f"{settings.KEYCLOAK_BASE_URL}/realms/{settings.KEYCLOAK_REALM}"
+JWKS_URL = f"{KEYCLOAK_ISSUER}/protocol/openid-connect/certs"
+# Minimum seconds between JWKS fetches triggered by an unknown key ID
+JWKS_REFRESH_INTERVAL = 60
+
+# Realm signing keys indexed by kid; refetched when a token names a kid we
+# have not seen, which is how Keycloak key rotation shows up
+_jwks_cache: Dict[str, Dict[str, Any]] = {}
+_jwks_last_refresh: float = 0.0
+
+
+async def _fetch_jwks() -> Dict[str, Dict[str, Any]]:
+    """Download the realm's public signing keys."""
+    response = await http_client.get(JWKS_URL)
+    response.raise_for_status()
+    return {key["kid"]: key for key in response.json()["keys"]}
+
+
+async def _get_signing_key(kid: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Look up a signing key, refreshing the JWKS at most once per interval."""
+    global _jwks_last_refresh
+    key = _jwks_cache.get(kid)
+    if key is None and time.monotonic() - _jwks_last_refresh >= JWKS_REFRESH_INTERVAL:
+        _jwks_last_refresh = time.monotonic()
+        keys = await _fetch_jwks()
+        _jwks_cache.clear()
+        _jwks_cache.update(keys)
+        key = _jwks_cache.get(kid)
+    return key
+
 async def create_user(
     username: str,
     email: str,
@@ -25,7 +70,8 @@ async def create_user(
 ) -> Dict[str, Any]:
     """Create a new user in Keycloak."""
     try:
-        user = await keycloak_client.create_user(
+        user = await _run_sdk(
+            keycloak_client.create_user,
             username=username,
             email=email,
             firstName=first_name,
@@ -44,7 +90,7 @@ async def create_user(
 async def update_user_roles(user_id: str, roles: list[str]) -> None:
     """Update user roles in Keycloak."""
     try:
-        await keycloak_client.assign_realm_roles(user_id, roles)
+        await _run_sdk(keycloak_client.assign_realm_roles, user_id, roles)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,7 +100,7 @@ async def update_user_roles(user_id: str, roles: list[str]) -> None:
 async def get_user_info(user_id: str) -> Dict[str, Any]:
     """Get user information from Keycloak."""
     try:
-        user = await keycloak_client.get_user(user_id)
+        user = await _run_sdk(keycloak_client.get_user, user_id)
         return user
     except Exception as e:
         raise HTTPException(
@@ -65,7 +111,7 @@ async def get_user_info(user_id: str) -> Dict[str, Any]:
 async def delete_user(user_id: str) -> None:
     """Delete a user from Keycloak."""
     try:
-        await keycloak_client.delete_user(user_id)
+        await _run_sdk(keycloak_client.delete_user, user_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -73,9 +119,30 @@ async def delete_user(user_id: str) -> None:
         )
 
 async def verify_token(token: str) -> Optional[OIDCUser]:
-    """Verify and decode a JWT token."""
+    """
+    Verify and decode a JWT token.
+
+    Tokens signed by a known realm key are checked locally against the cached
+    JWKS; only tokens naming an unknown key fall back to asking Keycloak.
+    """
     try:
-        return await keycloak_client.get_current_user(token)
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = await _get_signing_key(kid)
+        if key is None:
+            return await _run_sdk(keycloak_client.get_current_user, token)
+        audience = settings.KEYCLOAK_AUDIENCE
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            issuer=KEYCLOAK_ISSUER,
+            audience=audience,
+            options={"verify_aud": audience is not None}
+        )
+        # Other clients in the realm share its signing keys
+        if claims.get("azp") != settings.KEYCLOAK_CLIENT_ID:
+            raise JWTError("Token was issued to another client")
+        return OIDCUser(**claims)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,7 +1,11 @@
 """Razorpay integration for payment processing."""
+import asyncio
+import hashlib
+import hmac
 from typing import Dict, Any, Optional
 import razorpay
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.config import settings
 
@@ -10,6 +14,30 @@ razorpay_client = razorpay.Client(
     auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
 )
 
+# Keyed HMAC state for payment signatures; copied per check so the key
+# schedule is derived from the secret only once. Built on first use so
+# importing this module does not require the secret.
+_hmac_template: Optional["hmac.HMAC"] = None
+
+
+def _signature_hmac() -> "hmac.HMAC":
+    """Return a fresh copy of the keyed HMAC, creating the template on first call."""
+    global _hmac_template
+    if _hmac_template is None:
+        _hmac_template = hmac.new(
+            settings.RAZORPAY_KEY_SECRET.encode(), b"", hashlib.sha256
+        )
+    return _hmac_template.copy()
+
+# Bounds blocking Razorpay SDK calls so a burst cannot take over the threadpool
+_rzp_sem = asyncio.Semaphore(settings.RAZORPAY_MAX_CONCURRENCY)
+
+
+async def _run_sdk(func, *args, **kwargs):
+    """Run a blocking Razorpay SDK call on the threadpool within the concurrency budget."""
+    async with _rzp_sem:
+        return await run_in_threadpool(func, *args, **kwargs)
+
 
 class RazorpayService:
     """Service for handling Razorpay payment operations."""
@@ -27,7 +55,7 @@ class RazorpayService:
                 "currency": currency,
                 "notes": notes or {}
             }
-            order = razorpay_client.order.create(data=order_data)
+            order = await _run_sdk(razorpay_client.order.create, data=order_data)
             return order
         except Exception as e:
             raise HTTPException(
@@ -43,23 +71,19 @@ class RazorpayService:
         signature: str
     ) -> bool:
         """Verify payment signature."""
-        try:
-            params_dict = {
-                'razorpay_order_id': order_id,
-                'razorpay_payment_id': payment_id,
-                'razorpay_signature': signature
-            }
-            razorpay_client.utility.verify_payment_signature(params_dict)
-            return True
-        except Exception:
+        # compare_digest raises on None or non-ASCII str; those never match
+        if not (isinstance(signature, str) and signature.isascii()):
             return False
+        digest = _signature_hmac()
+        digest.update(f"{order_id}|{payment_id}".encode())
+        return hmac.compare_digest(digest.hexdigest(), signature)
 
 
     @staticmethod
     async def get_payment_details(payment_id: str) -> Dict[str, Any]:
         """Get payment details by payment ID."""
         try:
-            payment = razorpay_client.payment.fetch(payment_id)
+            payment = await _run_sdk(razorpay_client.payment.fetch, payment_id)
             return payment
         except Exception as e:
             raise HTTPException(
@@ -78,7 +102,9 @@ class RazorpayService:
             refund_data = {"payment_id": payment_id}
             if amount:
                 refund_data["amount"] = amount * 100
-            refund = razorpay_client.payment.refund(payment_id, refund_data)
+            refund = await _run_sdk(
+                razorpay_client.payment.refund, payment_id, refund_data
+            )
             return refund
         except Exception as e:
             raise HTTPException(
@@ -91,7 +117,7 @@ class RazorpayService:
     async def get_subscription_plans() -> Dict[str, Any]:
         """Get all subscription plans."""
         try:
-            plans = razorpay_client.plan.all()
+            plans = await _run_sdk(razorpay_client.plan.all)
             return plans
         except Exception as e:
             raise HTTPException(
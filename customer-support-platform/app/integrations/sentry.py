@@ -10,6 +10,9 @@ import logging
 
 from app.config import settings
 
+# Request headers stripped from events, compared case-insensitively
+_SENSITIVE_HEADERS = frozenset({'authorization', 'cookie', 'x-api-key'})
+
 
 def init_sentry() -> None:
     """Initialize Sentry SDK with all integrations."""
@@ -57,10 +60,9 @@ def before_send(event: dict, hint: Optional[dict]) -> Optional[dict]:
     # Filter out sensitive information
     if 'request' in event and 'headers' in event['request']:
         # Remove sensitive headers
-        sensitive_headers = ['authorization', 'cookie', 'x-api-key']
         event['request']['headers'] = {
             k: v for k, v in event['request']['headers'].items()
-            if k.lower() not in sensitive_headers
+            if k.casefold() not in _SENSITIVE_HEADERS
         }
 
     return event
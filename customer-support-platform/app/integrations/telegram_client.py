@@ -10,16 +10,38 @@ import asyncio
 from app.config import settings
 from app.core.logging import logger
 
-# Initialize bot and dispatcher
-bot = Bot(token=settings.TELEGRAM_BOT_TOKEN, parse_mode=ParseMode.HTML)
-dp = Dispatcher()
+# Bot and dispatcher are created on first use so importing this module does
+# not set up an aiohttp session
+_bot: Optional[Bot] = None
+_dp: Optional[Dispatcher] = None
+
+
+def get_bot() -> Bot:
+    """Return the shared bot, creating it on first call."""
+    global _bot
+    if _bot is None:
+        _bot = Bot(token=settings.TELEGRAM_BOT_TOKEN, parse_mode=ParseMode.HTML)
+    return _bot
+
+
+def get_dispatcher() -> Dispatcher:
+    """Return the shared dispatcher, creating it on first call."""
+    global _dp
+    if _dp is None:
+        _dp = Dispatcher()
+    return _dp
 
 
 class TelegramClient:
     """Telegram client for configuration only."""
-    def __init__(self):
-        self.bot = bot
-        self.dp = dp
+
+    @property
+    def bot(self) -> Bot:
+        return get_bot()
+
+    @property
+    def dp(self) -> Dispatcher:
+        return get_dispatcher()
 
 
 # Initialize global telegram client
@@ -30,7 +52,14 @@ async def start_polling():
     """Start the bot polling."""
     try:
         logger.info("Starting Telegram bot polling...")
-        await dp.start_polling(bot)
+        await get_dispatcher().start_polling(get_bot())
     except Exception as e:
         logger.error(f"Error starting Telegram bot: {str(e)}")
         raise
+
+
+if __name__ == "__main__":
+    # Dedicated long-polling process; the beat task stands down for it
+    if settings.TELEGRAM_POLLER != "worker":
+        raise SystemExit('Set TELEGRAM_POLLER="worker" to run the dedicated Telegram poller')
+    asyncio.run(start_polling())
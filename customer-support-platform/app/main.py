@@ -1,27 +1,117 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware 
-from fastapi.responses import JSONResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
 import logging
 
+from app.api.responses import JSONBytesResponse
 from app.config import settings
-from app.core.database import get_db
+from app.core.database import apply_bootstrap_ddl, engine
+from app.core.http import http_client
+from app.core.message_queue import get_connection as get_amqp_connection
+from app.core.message_queue import init_rabbitmq_pool
+from app.core.redis import redis as redis_client
 from app.core.metrics import setup_metrics
 from app.core.logging import get_logger
+from app.core.security import listen_for_token_invalidation
+from app.dependencies.rbac import listen_for_role_changes
 from app.integrations.sentry import init_sentry
+from app.services.analytics_buffer import run_flusher as run_analytics_flusher
 from app.integrations.keycloak import KeycloakClient
 from app.integrations.razorpay import RazorpayClient
 from app.api.v1 import router as api_router
-import redis
-import pika
+import asyncio
+import time
 
 logger = get_logger(__name__)
 
 # Initialize Sentry at startup
 init_sentry()
 
+# Long-running background tasks; referenced here so they are not collected
+# and cancelled together on shutdown
+_background_tasks: set = set()
+
+# Seconds between RabbitMQ connection attempts while the broker is down
+AMQP_CONNECT_RETRY_DELAY = 5
+
+
+def _start_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def start_token_invalidation_listener() -> None:
+    """Run the token invalidation subscriber for the lifetime of the app."""
+    _start_background(listen_for_token_invalidation())
+
+
+async def start_role_invalidation_listener() -> None:
+    """Run the RoleGuard cache invalidation subscriber for the lifetime of the app."""
+    _start_background(listen_for_role_changes())
+
+
+async def connect_broker(app: FastAPI) -> None:
+    """Connect to RabbitMQ, retrying until the broker is reachable."""
+    while True:
+        try:
+            app.state.amqp = await get_amqp_connection()
+            await init_rabbitmq_pool()
+            return
+        except Exception as e:
+            logger.warning(
+                f"RabbitMQ unavailable, retrying in {AMQP_CONNECT_RETRY_DELAY}s: {e}"
+            )
+            await asyncio.sleep(AMQP_CONNECT_RETRY_DELAY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up shared clients and background listeners for the app's lifetime."""
+    app.state.http = http_client
+    app.state.redis = redis_client
+    # Set once connect_broker succeeds; the API serves without the broker
+    app.state.amqp = None
+
+    # There are no migrations; keep triggers and views current on every boot
+    try:
+        await apply_bootstrap_ddl()
+    except Exception as e:
+        logger.error(f"Applying bootstrap DDL failed: {e}")
+
+    _start_background(connect_broker(app))
+
+    # Keep the in-process token caches in sync with Redis invalidations
+    await start_token_invalidation_listener()
+    await start_role_invalidation_listener()
+
+    # Telegram is polled by a single process chosen by TELEGRAM_POLLER, never
+    # by the API workers
+
+    # Batched analytics writes; cancelling it flushes what is still buffered
+    analytics_flusher = asyncio.create_task(run_analytics_flusher())
+
+    try:
+        yield
+    finally:
+        analytics_flusher.cancel()
+        for task in list(_background_tasks):
+            task.cancel()
+        await asyncio.gather(
+            analytics_flusher, *_background_tasks, return_exceptions=True
+        )
+        await http_client.aclose()
+        await redis_client.close()
+        if app.state.amqp is not None:
+            await app.state.amqp.close()
+
+
 def create_application() -> FastAPI:
     app = FastAPI(
+        lifespan=lifespan,
+        default_response_class=JSONBytesResponse,
         title=settings.PROJECT_NAME,
         description=settings.DESCRIPTION,
         version=settings.VERSION,
@@ -55,12 +145,23 @@ async def health_check():
     """Basic health check endpoint."""
     return {"status": "healthy"}
 
+# Seconds a successful database check is reused, so frequent probes do not
+# each take a pool connection
+DB_HEALTH_CACHE_SECONDS = 2.0
+_db_healthy_at = 0.0
+
 @app.get("/health/db")
-async def db_health_check(db: AsyncSession = Depends(get_db)):
+async def db_health_check():
     """Database health check endpoint."""
+    global _db_healthy_at
     try:
-        # Test DB connection
-        await db.execute("SELECT 1")
+        if time.monotonic() - _db_healthy_at < DB_HEALTH_CACHE_SECONDS:
+            return {"database": "connected"}
+
+        # Test DB connection; the connection goes back to the pool right away
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        _db_healthy_at = time.monotonic()
         return {"database": "connected"}
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
@@ -74,7 +175,7 @@ async def keycloak_health_check():
     try:
         kc = KeycloakClient()
         # Try to get the server info or realm info
-        info = kc.admin.get_server_info()
+        info = await run_in_threadpool(kc.admin.get_server_info)
         return {"keycloak": "connected", "info": info}
     except Exception as e:
         logger.error(f"Keycloak health check failed: {str(e)}")
@@ -85,28 +186,27 @@ async def razorpay_health_check():
     try:
         client = RazorpayClient()
         # Try to fetch something simple (e.g. plans)
-        plans = client.client.plan.all({'count': 1})
+        plans = await run_in_threadpool(client.client.plan.all, {'count': 1})
         return {"razorpay": "connected", "plans": plans.get('items', [])}
     except Exception as e:
         logger.error(f"Razorpay health check failed: {str(e)}")
         raise HTTPException(status_code=503, detail="Razorpay connection failed")
 
 @app.get("/health/redis")
-async def redis_health_check():
+async def redis_health_check(request: Request):
     try:
-        r = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0)
-        pong = r.ping()
+        pong = await request.app.state.redis.ping()
         return {"redis": "connected", "pong": pong}
     except Exception as e:
         logger.error(f"Redis health check failed: {str(e)}")
         raise HTTPException(status_code=503, detail="Redis connection failed")
 
 @app.get("/health/rabbitmq")
-async def rabbitmq_health_check():
+async def rabbitmq_health_check(request: Request):
     try:
-        params = pika.ConnectionParameters(host=settings.RABBITMQ_HOST, port=settings.RABBITMQ_PORT)
-        conn = pika.BlockingConnection(params)
-        conn.close()
+        amqp = request.app.state.amqp
+        if amqp is None or amqp.is_closed:
+            raise ConnectionError("connection is closed")
         return {"rabbitmq": "connected"}
     except Exception as e:
         logger.error(f"RabbitMQ health check failed: {str(e)}")
@@ -123,6 +223,35 @@ async def sentry_health_check():
         logger.error(f"Sentry health check failed: {str(e)}")
         raise HTTPException(status_code=503, detail="Sentry config check failed")
 
+async def _run_probe(check) -> dict:
+    """Await one health check, reporting a failure instead of raising it."""
+    try:
+        return await check
+    except HTTPException as e:
+        return {"status": "unhealthy", "detail": e.detail}
+
+@app.get("/health/all")
+async def aggregate_health_check(request: Request):
+    """Run every dependency health check concurrently."""
+    checks = {
+        "database": db_health_check(),
+        "keycloak": keycloak_health_check(),
+        "razorpay": razorpay_health_check(),
+        "redis": redis_health_check(request),
+        "rabbitmq": rabbitmq_health_check(request),
+        "sentry": sentry_health_check(),
+    }
+    async with asyncio.TaskGroup() as tg:
+        tasks = {name: tg.create_task(_run_probe(check)) for name, check in checks.items()}
+
+    results = {name: task.result() for name, task in tasks.items()}
+    if any(result.get("status") == "unhealthy" for result in results.values()):
+        return JSONBytesResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=results
+        )
+    return results
+
 @app.get("/", include_in_schema=False)
 async def root():
     """Root endpoint with basic API information."""
@@ -136,9 +265,11 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
-        app, 
+        "app.main:app",
         host=settings.SERVER_HOST, 
         port=settings.SERVER_PORT, 
         workers=settings.WORKERS_COUNT, 
+        loop="uvloop",
+        http="httptools",
         reload=settings.RELOAD
     )
\ No newline at end of file
@@ -2,21 +2,23 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import DateTime, String, ForeignKey, JSON
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.ids import uuid7
 from .base import Base
 
 
 class AICrewJob(Base):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     ticket_id: Mapped[Optional[UUID]] = mapped_column(
         ForeignKey("ticket.id", ondelete="CASCADE")
     )
     crew_type: Mapped[str] = mapped_column(String(20), nullable=False)
     job_id: Mapped[Optional[str]] = mapped_column(String(255))
-    input_data: Mapped[dict] = mapped_column(JSON)
-    output_data: Mapped[Optional[dict]] = mapped_column(JSON)
+    input_data: Mapped[dict] = mapped_column(JSONB)
+    output_data: Mapped[Optional[dict]] = mapped_column(JSONB)
     status: Mapped[str] = mapped_column(
         String(20),
         nullable=False,
@@ -26,10 +28,15 @@ class AICrewJob(Base):
     started_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=datetime.utcnow
+        server_default=func.now()
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     error_message: Mapped[Optional[str]] = mapped_column(String)
 
     # Relationships
-    ticket = relationship("Ticket")
\ No newline at end of file
+    ticket = relationship("Ticket", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_ai_jobs_ticket_status", "ticket_id", "status"),
+        Index("ix_ai_jobs_status_started", "status", "started_at"),
+    )
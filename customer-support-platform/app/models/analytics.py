@@ -3,14 +3,18 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Date, ForeignKey, Integer, JSON, Numeric
+from sqlalchemy import (
+    DDL, BigInteger, Date, ForeignKey, Index, Integer, Numeric, String, Uuid,
+    column, event, table
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, TimestampMixin
+from app.core.ids import uuid7
+from .base import Base, TimestampMixin, bootstrap_ddl
 
 
 class TicketAnalytics(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
         nullable=False
@@ -39,9 +43,126 @@ class TicketAnalytics(Base, TimestampMixin):
     avg_resolution_time_hours: Mapped[Optional[Decimal]] = mapped_column(
         Numeric(10, 2)
     )
-    criticality_breakdown: Mapped[dict] = mapped_column(JSON)
+
+    # Tickets per criticality level
+    crit_low: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+    crit_medium: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+    crit_high: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+    crit_critical: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
 
     # Relationships
-    organization = relationship("Organization")
-    category = relationship("Category")
-    agent = relationship("User")
\ No newline at end of file
+    # Loaded only on request (selectinload); lazy loads would be N+1 on lists
+    organization = relationship("Organization", lazy="raise")
+    category = relationship("Category", lazy="raise")
+    agent = relationship("User", lazy="raise")
+
+    __table_args__ = (
+        # One row per bucket; the target of batched counter upserts
+        Index(
+            "uq_ticket_analytics_bucket",
+            "organization_id",
+            "date",
+            "category_id",
+            "agent_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True
+        ),
+        Index("ix_ticket_analytics_org_date", "organization_id", "date"),
+        Index(
+            "ix_ticket_analytics_org_cat_date",
+            "organization_id",
+            "category_id",
+            "date"
+        ),
+    )
+
+
+# Per-day ticket aggregates precomputed from the ticket table. Stats queries
+# read these rows instead of scanning tickets; the view is refreshed hourly
+# by the analytics.refresh_daily_view task, so it trails live data by up to
+# an hour. Sums are kept alongside counts so averages stay exact when days
+# are combined.
+ticket_analytics_daily = table(
+    "ticket_analytics_daily",
+    column("organization_id", Uuid),
+    column("day", Date),
+    column("category_id", Uuid),
+    column("agent_id", Uuid),
+    column("channel", String),
+    column("status", String),
+    column("criticality", String),
+    column("ticket_count", BigInteger),
+    column("resolution_count", BigInteger),
+    column("resolution_hours_sum", Numeric),
+    column("within_sla_count", BigInteger),
+    column("first_response_count", BigInteger),
+    column("first_response_hours_sum", Numeric),
+)
+
+_CREATE_TICKET_ANALYTICS_DAILY = DDL("""
+CREATE MATERIALIZED VIEW IF NOT EXISTS ticket_analytics_daily AS
+SELECT
+    t.organization_id,
+    (t.created_at AT TIME ZONE 'UTC')::date AS day,
+    t.category_id,
+    t.assigned_agent_id AS agent_id,
+    t.channel,
+    t.status::text AS status,
+    t.criticality::text AS criticality,
+    count(*) AS ticket_count,
+    count(t.resolved_at) AS resolution_count,
+    sum(EXTRACT(EPOCH FROM t.resolved_at - t.created_at) / 3600)
+        AS resolution_hours_sum,
+    count(*) FILTER (
+        WHERE t.resolved_at - t.created_at
+            <= make_interval(mins => coalesce(c.resolution_sla_minutes, 480))
+    ) AS within_sla_count,
+    count(fr.first_response_at) AS first_response_count,
+    sum(EXTRACT(EPOCH FROM fr.first_response_at - t.created_at) / 3600)
+        AS first_response_hours_sum
+FROM ticket t
+LEFT JOIN category c ON c.id = t.category_id
+LEFT JOIN LATERAL (
+    SELECT min(m.created_at) AS first_response_at
+    FROM ticketmessage m
+    WHERE m.ticket_id = t.id AND m.sender_type = 'agent'
+) fr ON true
+GROUP BY 1, 2, 3, 4, 5, 6, 7
+""")
+
+# REFRESH ... CONCURRENTLY needs a unique index covering every row
+_INDEX_TICKET_ANALYTICS_DAILY = DDL("""
+CREATE UNIQUE INDEX IF NOT EXISTS uq_ticket_analytics_daily_bucket
+ON ticket_analytics_daily (
+    organization_id, day, category_id, agent_id, channel, status, criticality
+) NULLS NOT DISTINCT
+""")
+
+_DROP_TICKET_ANALYTICS_DAILY = DDL(
+    "DROP MATERIALIZED VIEW IF EXISTS ticket_analytics_daily"
+)
+
+event.listen(Base.metadata, "after_create", _CREATE_TICKET_ANALYTICS_DAILY)
+event.listen(Base.metadata, "after_create", _INDEX_TICKET_ANALYTICS_DAILY)
+event.listen(Base.metadata, "before_drop", _DROP_TICKET_ANALYTICS_DAILY)
+bootstrap_ddl.extend([_CREATE_TICKET_ANALYTICS_DAILY, _INDEX_TICKET_ANALYTICS_DAILY])
@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, List
 from uuid import uuid4
 
-from sqlalchemy import DateTime, MetaData
+from sqlalchemy import DDL, DateTime, MetaData
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -17,6 +17,10 @@ convention = {
 
 metadata = MetaData(naming_convention=convention)
 
+# Idempotent DDL (functions, triggers, views) that create_all only emits for
+# new tables; re-applied at startup so existing databases pick it up
+bootstrap_ddl: List[DDL] = []
+
 class Base(DeclarativeBase):
     metadata = metadata
     
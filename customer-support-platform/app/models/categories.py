@@ -1,14 +1,15 @@
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Boolean, String, ForeignKey, JSON
+from sqlalchemy import Boolean, Index, String, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.ids import uuid7
 from .base import Base, TimestampMixin
 
 
 class Category(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
         nullable=False
@@ -49,9 +50,18 @@ class Category(Base, TimestampMixin):
     )
     tickets = relationship("Ticket", back_populates="category")
 
+    __table_args__ = (
+        # Name lookups per organization; is_active is included so status
+        # filtered listings can be answered from the index alone
+        Index(
+            "ix_category_org_name", "organization_id", "name",
+            unique=True, postgresql_include=["is_active"]
+        ),
+    )
+
 
 class UserCategoryAssignment(Base):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey("user.id", ondelete="CASCADE"),
         nullable=False
@@ -64,3 +74,7 @@ class UserCategoryAssignment(Base):
     # Relationships
     user = relationship("User", back_populates="category_assignments")
     category = relationship("Category", back_populates="assigned_users")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "category_id"),
+    )
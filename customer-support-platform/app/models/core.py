@@ -2,14 +2,15 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, Integer, String, ForeignKey
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, ForeignKey, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.ids import uuid7
 from .base import Base, TimestampMixin
 
 
 class Organization(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     sector: Mapped[Optional[str]] = mapped_column(String(100))
     employee_count: Mapped[Optional[int]] = mapped_column(Integer)
@@ -38,6 +39,22 @@ class Organization(Base, TimestampMixin):
         server_default="true"
     )
 
+    # Lifetime ticket counters, kept current by the ticket_org_counters
+    # trigger and recounted nightly
+    total_ticket_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+    open_ticket_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+    last_closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
     # Relationships
     users = relationship("User", back_populates="organization")
     categories = relationship("Category", back_populates="organization")
@@ -47,7 +64,7 @@ class Organization(Base, TimestampMixin):
 
 
 class User(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
         nullable=False
@@ -86,4 +103,12 @@ class User(Base, TimestampMixin):
     category_assignments = relationship(
         "UserCategoryAssignment",
         back_populates="user"
+    )
+
+    __table_args__ = (
+        # Role counts only consider active users
+        Index(
+            "ix_user_active_role", "organization_id", "role",
+            postgresql_where=text("is_active")
+        ),
     )
\ No newline at end of file
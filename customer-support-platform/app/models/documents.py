@@ -1,14 +1,16 @@
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Boolean, Integer, String, ForeignKey
+from sqlalchemy import Boolean, Computed, Index, Integer, String, ForeignKey, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.ids import uuid7
 from .base import Base, TimestampMixin
 
 
 class Document(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
         nullable=False
@@ -28,6 +30,16 @@ class Document(Base, TimestampMixin):
         ForeignKey("user.id", ondelete="SET NULL")
     )
 
+    # Full-text search vector, maintained by Postgres and never loaded by default
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))",
+            persisted=True
+        ),
+        deferred=True
+    )
+
     # Relationships
     organization = relationship("Organization", back_populates="documents")
     uploader = relationship("User")
@@ -36,9 +48,25 @@ class Document(Base, TimestampMixin):
         back_populates="document"
     )
 
+    __table_args__ = (
+        Index("ix_document_org_created", "organization_id", text("created_at DESC")),
+        # Lets storage totals be summed from the index alone
+        Index(
+            "ix_document_org_size", "organization_id",
+            postgresql_include=["file_size"],
+            postgresql_where=text("file_size IS NOT NULL")
+        ),
+        # Trigram indexes so substring (ILIKE) search can use an index (requires pg_trgm)
+        Index("ix_document_trgm_title", "title", postgresql_using="gin",
+              postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_document_trgm_content", "content", postgresql_using="gin",
+              postgresql_ops={"content": "gin_trgm_ops"}),
+        Index("ix_document_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class DocumentCategoryAssignment(Base):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     document_id: Mapped[UUID] = mapped_column(
         ForeignKey("document.id", ondelete="CASCADE"),
         nullable=False
@@ -50,4 +78,8 @@ class DocumentCategoryAssignment(Base):
 
     # Relationships
     document = relationship("Document", back_populates="categories")
-    category = relationship("Category", back_populates="documents")
\ No newline at end of file
+    category = relationship("Category", back_populates="documents")
+
+    __table_args__ = (
+        UniqueConstraint("document_id", "category_id"),
+    )
\ No newline at end of file
@@ -3,14 +3,15 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy import Date, ForeignKey, Index, Numeric, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.ids import uuid7
 from .base import Base, TimestampMixin
 
 
 class PaymentTransaction(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
         nullable=False
@@ -38,4 +39,24 @@ class PaymentTransaction(Base, TimestampMixin):
     billing_period_end: Mapped[Optional[date]] = mapped_column(Date)
 
     # Relationships
-    organization = relationship("Organization")
\ No newline at end of file
+    organization = relationship("Organization")
+
+    __table_args__ = (
+        Index(
+            "ix_payment_transaction_org_created",
+            "organization_id", text("created_at DESC")
+        ),
+        # Lets paid totals be summed from the index alone
+        Index(
+            "ix_payment_transaction_org_paid",
+            "organization_id", "created_at",
+            postgresql_include=["amount"],
+            postgresql_where=text("status = 'captured'")
+        ),
+        # Active subscription checks only ever look at captured payments
+        Index(
+            "ix_payment_transaction_active_sub",
+            "organization_id", "billing_period_end",
+            postgresql_where=text("status = 'captured'")
+        ),
+    )
\ No newline at end of file
@@ -3,14 +3,25 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, Integer, String, ForeignKey, Numeric
+from sqlalchemy import (
+    DDL, Boolean, DateTime, Enum, Index, Integer, String, ForeignKey, Numeric,
+    event, text
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, TimestampMixin
+from app.core.ids import uuid7
+from app.utils.enums import TicketCriticality, TicketStatus
+from .base import Base, TimestampMixin, bootstrap_ddl
+
+
+def _enum_values(enum_cls) -> list:
+    """Store enum values (e.g. "open"), not member names, in the database."""
+    return [member.value for member in enum_cls]
 
 
 class Customer(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
         nullable=False
@@ -25,9 +36,24 @@ class Customer(Base, TimestampMixin):
     organization = relationship("Organization", back_populates="customers")
     tickets = relationship("Ticket", back_populates="customer")
 
+    # Trigram indexes backing fuzzy customer search (requires pg_trgm)
+    __table_args__ = (
+        Index("ix_customer_org_email", "organization_id", "email"),
+        Index(
+            "ix_customer_org_channel",
+            "organization_id", "channel", "channel_identifier"
+        ),
+        Index("ix_customer_trgm_name", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_customer_trgm_email", "email", postgresql_using="gin",
+              postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_customer_trgm_phone", "phone", postgresql_using="gin",
+              postgresql_ops={"phone": "gin_trgm_ops"}),
+    )
+
 
 class Ticket(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
         nullable=False
@@ -49,22 +75,26 @@ class Ticket(Base, TimestampMixin):
     channel: Mapped[str] = mapped_column(String(20), nullable=False)
 
     # AI Assessment
-    criticality: Mapped[str] = mapped_column(
-        String(20),
+    criticality: Mapped[TicketCriticality] = mapped_column(
+        Enum(
+            TicketCriticality,
+            name="ticket_criticality",
+            values_callable=_enum_values
+        ),
         nullable=False,
-        default="low",
-        server_default="low"
+        default=TicketCriticality.LOW,
+        server_default=TicketCriticality.LOW.value
     )
     ai_confidence_score: Mapped[Optional[Decimal]] = mapped_column(
         Numeric(3, 2)
     )
 
     # Status tracking
-    status: Mapped[str] = mapped_column(
-        String(20),
+    status: Mapped[TicketStatus] = mapped_column(
+        Enum(TicketStatus, name="ticket_status", values_callable=_enum_values),
         nullable=False,
-        default="open",
-        server_default="open"
+        default=TicketStatus.OPEN,
+        server_default=TicketStatus.OPEN.value
     )
 
     # Status timestamps
@@ -79,9 +109,72 @@ class Ticket(Base, TimestampMixin):
     assigned_agent = relationship("User", back_populates="assigned_tickets")
     messages = relationship("TicketMessage", back_populates="ticket")
 
+    __table_args__ = (
+        Index("ix_ticket_customer_created", "customer_id", text("created_at DESC")),
+        Index("ix_ticket_org_created", "organization_id", text("created_at DESC")),
+        Index("ix_ticket_org_status", "organization_id", "status"),
+        # Unresolved tickets only; backs open-ticket counts and agent load
+        Index(
+            "ix_ticket_org_open", "organization_id",
+            postgresql_where=text("status NOT IN ('resolved', 'closed')")
+        ),
+        Index("ix_ticket_org_category", "organization_id", "category_id"),
+        Index(
+            "ix_ticket_agent_created",
+            "assigned_agent_id", "organization_id", text("created_at DESC")
+        ),
+    )
+
+
+# Maintains Organization.total_ticket_count, open_ticket_count and
+# last_closed_at as tickets are inserted, updated and deleted
+_CREATE_TICKET_ORG_COUNTERS = DDL("""
+CREATE OR REPLACE FUNCTION ticket_org_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.organization_id = NEW.organization_id THEN
+        UPDATE organization SET
+            open_ticket_count = open_ticket_count
+                + (NEW.status NOT IN ('resolved', 'closed'))::int
+                - (OLD.status NOT IN ('resolved', 'closed'))::int,
+            last_closed_at = greatest(last_closed_at, NEW.closed_at)
+        WHERE id = NEW.organization_id;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE organization SET
+            total_ticket_count = total_ticket_count - 1,
+            open_ticket_count = open_ticket_count
+                - (OLD.status NOT IN ('resolved', 'closed'))::int
+        WHERE id = OLD.organization_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE organization SET
+            total_ticket_count = total_ticket_count + 1,
+            open_ticket_count = open_ticket_count
+                + (NEW.status NOT IN ('resolved', 'closed'))::int,
+            last_closed_at = greatest(last_closed_at, NEW.closed_at)
+        WHERE id = NEW.organization_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+
+_CREATE_TICKET_ORG_TRIGGER = DDL("""
+CREATE OR REPLACE TRIGGER ticket_org_counters
+AFTER INSERT OR DELETE OR UPDATE OF status, organization_id, closed_at ON ticket
+FOR EACH ROW EXECUTE FUNCTION ticket_org_counters()
+""")
+
+event.listen(Ticket.__table__, "after_create", _CREATE_TICKET_ORG_COUNTERS)
+event.listen(Ticket.__table__, "after_create", _CREATE_TICKET_ORG_TRIGGER)
+bootstrap_ddl.extend([_CREATE_TICKET_ORG_COUNTERS, _CREATE_TICKET_ORG_TRIGGER])
+
 
 class TicketMessage(Base, TimestampMixin):
-    id: Mapped[UUID] = mapped_column(primary_key=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     ticket_id: Mapped[UUID] = mapped_column(
         ForeignKey("ticket.id", ondelete="CASCADE"),
         nullable=False
@@ -97,7 +190,15 @@ class TicketMessage(Base, TimestampMixin):
         default=False,
         server_default="false"
     )
+    # {user_id: read_at} for every user who has read the message
+    read_by: Mapped[Optional[dict]] = mapped_column(JSONB)
 
     # Relationships
     ticket = relationship("Ticket", back_populates="messages")
-    sender = relationship("User")
\ No newline at end of file
+    sender = relationship("User")
+
+    __table_args__ = (
+        Index("ix_ticketmessage_ticket_created", "ticket_id", "created_at"),
+        # Answers read_by ? :user_id when counting unread messages
+        Index("ix_ticketmessage_read_by", "read_by", postgresql_using="gin"),
+    )
\ No newline at end of file
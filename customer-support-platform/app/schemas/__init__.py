@@ -1,89 +1,79 @@
-from .base import BaseSchema, BaseCreate, BaseUpdate, BaseInDB
-from .organization import (
-    Organization, OrganizationCreate, OrganizationUpdate, OrganizationInDB
-)
-from .users import User, UserCreate, UserUpdate, UserInDB
-from .ticket import Ticket, TicketCreate, TicketUpdate, TicketInDB
-from .ticket_message import TicketMessage, TicketMessageCreate, TicketMessageInDB
-from .category import Category, CategoryCreate, CategoryUpdate, CategoryInDB
-from .document import Document, DocumentCreate, DocumentUpdate, DocumentInDB
-from .document_category import (
-    DocumentCategoryAssignment,
-    DocumentCategoryAssignmentCreate,
-    DocumentCategoryAssignmentInDB
-)
-from .agent_category import (
-    AgentCategoryAssignment,
-    AgentCategoryAssignmentCreate,
-    AgentCategoryAssignmentInDB
-)
-from .payment import (
-    PaymentTransaction,
-    PaymentTransactionCreate,
-    PaymentTransactionInDB
-)
-from .analytics import (
-    TicketAnalytics,
-    TicketAnalyticsCreate,
-    TicketAnalyticsUpdate,
-    TicketAnalyticsInDB
-)
+"""
+Schema package exports.
 
+Schema modules are imported on first attribute access (PEP 562), so
+importing one submodule does not build every model in the package.
+"""
+from importlib import import_module
 
-# Base
-__all__ = [
-    'BaseSchema', 'BaseCreate', 'BaseUpdate', 'BaseInDB',
-]
+# Exported name -> submodule that defines it
+_LAZY = {
+    # Base
+    'BaseSchema': 'base',
+    'BaseCreate': 'base',
+    'BaseUpdate': 'base',
+    'BaseInDB': 'base',
+    # Organization
+    'Organization': 'organization',
+    'OrganizationCreate': 'organization',
+    'OrganizationUpdate': 'organization',
+    'OrganizationInDB': 'organization',
+    # User
+    'User': 'users',
+    'UserCreate': 'users',
+    'UserUpdate': 'users',
+    'UserInDB': 'users',
+    # Ticket
+    'Ticket': 'ticket',
+    'TicketCreate': 'ticket',
+    'TicketUpdate': 'ticket',
+    'TicketInDB': 'ticket',
+    # Ticket Message
+    'TicketMessage': 'ticket_message',
+    'TicketMessageCreate': 'ticket_message',
+    'TicketMessageInDB': 'ticket_message',
+    # Category
+    'Category': 'categories',
+    'CategoryCreate': 'categories',
+    'CategoryUpdate': 'categories',
+    'CategoryInDB': 'categories',
+    # Document
+    'Document': 'documents',
+    'DocumentCreate': 'documents',
+    'DocumentUpdate': 'documents',
+    'DocumentInDB': 'documents',
+    # Document Category
+    'DocumentCategoryAssignment': 'document_category',
+    'DocumentCategoryAssignmentCreate': 'document_category',
+    'DocumentCategoryAssignmentInDB': 'document_category',
+    # Agent Category
+    'AgentCategoryAssignment': 'agent_category',
+    'AgentCategoryAssignmentCreate': 'agent_category',
+    'AgentCategoryAssignmentInDB': 'agent_category',
+    # Payment
+    'PaymentTransaction': 'payments',
+    'PaymentTransactionCreate': 'payments',
+    'PaymentTransactionInDB': 'payments',
+    # Analytics
+    'TicketAnalytics': 'analytics',
+    'TicketAnalyticsCreate': 'analytics',
+    'TicketAnalyticsUpdate': 'analytics',
+    'TicketAnalyticsInDB': 'analytics',
+}
 
-# Organization
-__all__ += [
-    'Organization', 'OrganizationCreate', 'OrganizationUpdate', 'OrganizationInDB',
-]
+__all__ = tuple(_LAZY)
 
-# User
-__all__ += [
-    'User', 'UserCreate', 'UserUpdate', 'UserInDB',
-]
 
-# Ticket
-__all__ += [
-    'Ticket', 'TicketCreate', 'TicketUpdate', 'TicketInDB',
-]
+def __getattr__(name: str):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
 
-# Ticket Message
-__all__ += [
-    'TicketMessage', 'TicketMessageCreate', 'TicketMessageInDB',
-]
 
-# Category
-__all__ += [
-    'Category', 'CategoryCreate', 'CategoryUpdate', 'CategoryInDB',
-]
-
-# Document
-__all__ += [
-    'Document', 'DocumentCreate', 'DocumentUpdate', 'DocumentInDB',
-]
-
-# Document Category
-__all__ += [
-    'DocumentCategoryAssignment', 'DocumentCategoryAssignmentCreate',
-    'DocumentCategoryAssignmentInDB',
-]
-
-# Agent Category
-__all__ += [
-    'AgentCategoryAssignment', 'AgentCategoryAssignmentCreate',
-    'AgentCategoryAssignmentInDB',
-]
-
-# Payment
-__all__ += [
-    'PaymentTransaction', 'PaymentTransactionCreate', 'PaymentTransactionInDB',
-]
-
-# Analytics
-__all__ += [
-    'TicketAnalytics', 'TicketAnalyticsCreate', 'TicketAnalyticsUpdate',
-    'TicketAnalyticsInDB',
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
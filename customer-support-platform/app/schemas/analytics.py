@@ -1,9 +1,12 @@
 from datetime import date, datetime
 from typing import Optional, Dict
-from pydantic import Field
+from pydantic import Field, StrictInt
 from .base import BaseSchema, BaseCreate, BaseUpdate, BaseInDB
 from uuid import UUID
 
+# Per-key ticket counts; strict ints are checked by type without coercion
+Counts = Dict[str, StrictInt]
+
 
 class TicketAnalyticsBase(BaseSchema):
     organization_id: UUID
@@ -13,9 +16,9 @@ class TicketAnalyticsBase(BaseSchema):
     closed_tickets: int = 0
     avg_resolution_time: Optional[float] = None
     avg_response_time: Optional[float] = None
-    category_metrics: Dict[str, int] = Field(default_factory=dict)
-    agent_metrics: Dict[str, int] = Field(default_factory=dict)
-    channel_metrics: Dict[str, int] = Field(default_factory=dict)
+    category_metrics: Counts = Field(default_factory=dict)
+    agent_metrics: Counts = Field(default_factory=dict)
+    channel_metrics: Counts = Field(default_factory=dict)
 
 
 
@@ -28,14 +31,10 @@ class TicketAnalyticsUpdate(TicketAnalyticsBase, BaseUpdate):
 
 
 class TicketAnalyticsInDB(TicketAnalyticsBase, BaseInDB):
-    class Config:
-        orm_mode = True
+    pass
 
 
 class TicketAnalytics(TicketAnalyticsBase):
     id: UUID
     created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    updated_at: datetime
\ No newline at end of file
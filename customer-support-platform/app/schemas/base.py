@@ -1,18 +1,27 @@
 from datetime import datetime
-from typing import Generic, TypeVar, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Generic, TypeVar, Optional
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 
 # Generic Type Vars
 T = TypeVar('T')
 
 class BaseSchema(BaseModel):
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            UUID: str
-        }
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_row(cls, obj: Any):
+        """
+        Build from a trusted ORM row without re-validating its fields.
+
+        Use for outbound reads only; request bodies still go through
+        validation.
+        """
+        return cls.model_construct(**{
+            name: getattr(obj, name)
+            for name in cls.model_fields
+            if hasattr(obj, name)
+        })
 
 class BaseCreate(BaseSchema):
     pass
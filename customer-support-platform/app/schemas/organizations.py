@@ -1,7 +1,7 @@
 """Pydantic models for organization-related schemas."""
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from app.core.config import settings
 from uuid import UUID
 
@@ -17,9 +17,7 @@ class OrganizationBase(BaseModel):
     is_active: bool = True
     metadata_: Optional[dict] = Field(None, alias="metadata")
 
-    class Config:
-        orm_mode = True
-        allow_population_by_field_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 class OrganizationCreate(OrganizationBase):
@@ -39,16 +37,15 @@ class OrganizationUpdate(BaseModel):
     is_active: Optional[bool] = None
     metadata_: Optional[dict] = Field(None, alias="metadata")
 
-    class Config:
-        orm_mode = True
-        allow_population_by_field_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 class OrganizationPlanUpdate(BaseModel):
     """Schema for updating an organization's plan."""
     plan: str
 
-    @validator('plan')
+    @field_validator('plan')
+    @classmethod
     def validate_plan(cls, v):
         """Validate that the plan exists in PLAN_LIMITS."""
         if v not in settings.PLAN_LIMITS:
@@ -61,6 +58,3 @@ class OrganizationResponse(OrganizationBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
-
-    class Config:
-        orm_mode = True
@@ -5,6 +5,7 @@ from uuid import UUID
 
 from pydantic import Field
 
+from app.utils.enums import TicketCriticality, TicketStatus
 from .base import BaseSchema, BaseCreate, BaseUpdate, BaseInDB
 
 
@@ -14,8 +15,8 @@ class TicketBase(BaseSchema):
     channel: str = Field(..., max_length=20)
     category_id: Optional[UUID] = None
     assigned_agent_id: Optional[UUID] = None
-    criticality: str = Field(default="low", max_length=20)
-    status: str = Field(default="open", max_length=20)
+    criticality: TicketCriticality = TicketCriticality.LOW
+    status: TicketStatus = TicketStatus.OPEN
 
 
 class TicketCreate(TicketBase, BaseCreate):
@@ -27,7 +28,7 @@ class TicketUpdate(TicketBase, BaseUpdate):
     subject: Optional[str] = Field(None, max_length=255)
     description: Optional[str] = None
     channel: Optional[str] = Field(None, max_length=20)
-    status: Optional[str] = Field(None, max_length=20)
+    status: Optional[TicketStatus] = None
 
 
 class TicketInDB(TicketBase, BaseInDB):
@@ -0,0 +1,145 @@
+"""In-process buffer that batches TicketAnalytics counter updates."""
+import asyncio
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.database import async_session_factory
+from app.core.logging import logger
+from app.models.analytics import TicketAnalytics
+
+# Seconds between background flushes
+FLUSH_INTERVAL = 1.0
+# Recorded events that trigger an early flush
+FLUSH_MAX_EVENTS = 500
+
+# Counters that are summed per analytics row
+COUNTER_FIELDS = (
+    "total_tickets",
+    "resolved_tickets",
+    "crit_low",
+    "crit_medium",
+    "crit_high",
+    "crit_critical",
+)
+
+# Columns identifying an analytics row: (organization_id, date, category_id, agent_id)
+AnalyticsKey = Tuple[UUID, date, Optional[UUID], Optional[UUID]]
+_KEY_COLUMNS = ("organization_id", "date", "category_id", "agent_id")
+
+_buffer: Dict[AnalyticsKey, Counter] = defaultdict(Counter)
+_pending_events = 0
+_flush_lock = asyncio.Lock()
+_early_flushes: set = set()
+# Only processes running run_flusher (the web app) buffer; Celery tasks and
+# queue consumers may exit before a flush, so they write through instead
+_flusher_running = False
+
+
+def _check_counters(deltas: Dict[str, int]) -> None:
+    unknown = set(deltas) - set(COUNTER_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown analytics counters: {', '.join(sorted(unknown))}")
+
+
+def is_buffering() -> bool:
+    """Whether this process runs the background flusher."""
+    return _flusher_running
+
+
+def record(
+    organization_id: UUID,
+    *,
+    category_id: Optional[UUID] = None,
+    agent_id: Optional[UUID] = None,
+    day: Optional[date] = None,
+    **deltas: int
+) -> None:
+    """Add counter deltas for an analytics row; written on the next flush."""
+    global _pending_events
+    _check_counters(deltas)
+
+    key = (organization_id, day or date.today(), category_id, agent_id)
+    _buffer[key].update(deltas)
+    _pending_events += 1
+
+    if _pending_events >= FLUSH_MAX_EVENTS and not _flush_lock.locked():
+        task = asyncio.create_task(flush())
+        _early_flushes.add(task)
+        task.add_done_callback(_early_flushes.discard)
+
+
+async def flush() -> int:
+    """Write buffered deltas in one INSERT ... ON CONFLICT DO UPDATE; returns rows written."""
+    global _buffer, _pending_events
+    async with _flush_lock:
+        if not _buffer:
+            return 0
+        batch, _buffer, _pending_events = _buffer, defaultdict(Counter), 0
+
+        try:
+            return await _write(batch)
+        except Exception:
+            # Put the deltas back so the next flush retries them
+            for key, counts in batch.items():
+                _buffer[key].update(counts)
+            raise
+
+
+async def record_now(
+    organization_id: UUID,
+    *,
+    category_id: Optional[UUID] = None,
+    agent_id: Optional[UUID] = None,
+    day: Optional[date] = None,
+    **deltas: int
+) -> None:
+    """Write counter deltas for one analytics row immediately, bypassing the buffer."""
+    _check_counters(deltas)
+    key = (organization_id, day or date.today(), category_id, agent_id)
+    await _write({key: Counter(deltas)})
+
+
+async def _write(batch: Dict[AnalyticsKey, Counter]) -> int:
+    """Upsert summed deltas in one INSERT ... ON CONFLICT DO UPDATE; returns rows written."""
+    rows = [
+        {
+            **dict(zip(_KEY_COLUMNS, key)),
+            **{field: counts[field] for field in COUNTER_FIELDS},
+        }
+        for key, counts in batch.items()
+    ]
+    stmt = pg_insert(TicketAnalytics).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_KEY_COLUMNS),
+        set_={
+            **{
+                field: getattr(TicketAnalytics, field) + stmt.excluded[field]
+                for field in COUNTER_FIELDS
+            },
+            "updated_at": stmt.excluded.updated_at,
+        }
+    )
+    async with async_session_factory() as db:
+        await db.execute(stmt)
+        await db.commit()
+    return len(rows)
+
+
+async def run_flusher() -> None:
+    """Flush on a timer until cancelled, then write whatever is left."""
+    global _flusher_running
+    _flusher_running = True
+    try:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await flush()
+            except Exception as e:
+                logger.error(f"Failed to flush analytics buffer: {str(e)}")
+    finally:
+        _flusher_running = False
+        await flush()
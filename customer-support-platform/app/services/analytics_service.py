@@ -1,6 +1,8 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+import orjson
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +12,12 @@ from app.core.redis import Cache
 from app.models.tickets import Ticket
 from app.models.analytics import TicketAnalytics
 from app.crud.analytics import analytics as analytics_crud
+from app.utils.formatters import format_json_bytes
+
+
+def cache_generation_key(organization_id: UUID) -> str:
+    """Redis key holding an organization's analytics cache generation."""
+    return f"analytics:gen:{organization_id}"
 
 
 class AnalyticsService:
@@ -18,6 +26,11 @@ class AnalyticsService:
         self.cache_prefix = "analytics:"
         self.cache_ttl = 300  # 5 minutes
 
+    async def _cache_generation(self, organization_id: UUID) -> int:
+        """Current cache generation for an organization, baked into its keys."""
+        value = await Cache.get_bytes(cache_generation_key(organization_id))
+        return int(value) if value else 0
+
     async def get_organization_stats(
         self,
         organization_id: UUID,
@@ -25,170 +38,67 @@ class AnalyticsService:
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Get comprehensive organization statistics."""
+        return orjson.loads(
+            await self.get_organization_stats_json(
+                organization_id,
+                start_date,
+                end_date
+            )
+        )
+
+    async def get_organization_stats_json(
+        self,
+        organization_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> bytes:
+        """
+        Get organization statistics as serialized JSON.
+
+        The cache holds the response bytes, so a hit is returned without
+        decoding or re-encoding.
+        """
         if not start_date:
             start_date = datetime.utcnow() - timedelta(days=30)
         if not end_date:
             end_date = datetime.utcnow()
 
+        generation = await self._cache_generation(organization_id)
         cache_key = (
-            f"{self.cache_prefix}org:"
-            f"{organization_id}:{start_date.date()}:{end_date.date()}"
+            f"{self.cache_prefix}org:{organization_id}:{generation}:"
+            f"{start_date.date()}:{end_date.date()}"
         )
 
         # Try cache first
-        cached_stats = await Cache.get(cache_key)
+        cached_stats = await Cache.get_bytes(cache_key)
         if cached_stats:
             return cached_stats
 
         try:
-            # Gather all stats
-            stats = {
-                "ticket_stats": await self._get_ticket_stats(
-                    organization_id,
-                    start_date,
-                    end_date
-                ),
-                "category_distribution": await self._get_category_distribution(
-                    organization_id,
-                    start_date,
-                    end_date
-                ),
-                "agent_performance": await self._get_agent_performance(
-                    organization_id,
-                    start_date,
-                    end_date
-                ),
-                "response_times": await self._get_response_times(
-                    organization_id,
-                    start_date,
-                    end_date
-                ),
-                "customer_satisfaction": await self._get_satisfaction_stats(
-                    organization_id,
-                    start_date,
-                    end_date
-                ),
-                "ticket_sources": await self._get_ticket_sources(
-                    organization_id,
-                    start_date,
-                    end_date
-                )
+            # All groups come back from a single statement
+            stats = await analytics_crud.get_all_org_stats(
+                self.db,
+                organization_id=organization_id,
+                start_date=start_date,
+                end_date=end_date
+            )
+            # Tickets do not record a satisfaction rating yet
+            stats["customer_satisfaction"] = {
+                "average_rating": None,
+                "satisfaction_rate": None,
+                "feedback_count": 0
             }
 
-            # Cache the results
-            await Cache.set(cache_key, stats, expire=self.cache_ttl)
-            return stats
+            # Cache the serialized results
+            payload = format_json_bytes(stats)
+            await Cache.set_bytes(cache_key, payload, expire=self.cache_ttl)
+            return payload
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to get organization stats: {str(e)}"
             )
 
-    async def _get_ticket_stats(
-        self,
-        organization_id: UUID,
-        start_date: datetime,
-        end_date: datetime
-    ) -> Dict[str, Any]:
-        """Get ticket-related statistics."""
-        result = await analytics_crud.get_ticket_stats(
-            self.db,
-            organization_id=organization_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-        return {
-            "total_tickets": result["total"],
-            "open_tickets": result["open"],
-            "resolved_tickets": result["resolved"],
-            "avg_resolution_time": result["avg_resolution_time"],
-            "high_priority": result["high_priority"],
-            "low_priority": result["low_priority"]
-        }
-
-    async def _get_category_distribution(
-        self,
-        organization_id: UUID,
-        start_date: datetime,
-        end_date: datetime
-    ) -> List[Dict[str, Any]]:
-        """Get ticket distribution across categories."""
-        return await analytics_crud.get_category_distribution(
-            self.db,
-            organization_id=organization_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-    async def _get_agent_performance(
-        self,
-        organization_id: UUID,
-        start_date: datetime,
-        end_date: datetime
-    ) -> List[Dict[str, Any]]:
-        """Get performance metrics for each agent."""
-        return await analytics_crud.get_agent_performance(
-            self.db,
-            organization_id=organization_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-    async def _get_response_times(
-        self,
-        organization_id: UUID,
-        start_date: datetime,
-        end_date: datetime
-    ) -> Dict[str, Any]:
-        """Get response time metrics."""
-        result = await analytics_crud.get_response_times(
-            self.db,
-            organization_id=organization_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-        return {
-            "average_first_response": result["avg_first_response"],
-            "average_resolution_time": result["avg_resolution_time"],
-            "within_sla": result["within_sla_percent"]
-        }
-
-    async def _get_satisfaction_stats(
-        self,
-        organization_id: UUID,
-        start_date: datetime,
-        end_date: datetime
-    ) -> Dict[str, Any]:
-        """Get customer satisfaction metrics."""
-        result = await analytics_crud.get_satisfaction_stats(
-            self.db,
-            organization_id=organization_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-        return {
-            "average_rating": result["avg_rating"],
-            "satisfaction_rate": result["satisfaction_rate"],
-            "feedback_count": result["feedback_count"]
-        }
-
-    async def _get_ticket_sources(
-        self,
-        organization_id: UUID,
-        start_date: datetime,
-        end_date: datetime
-    ) -> List[Dict[str, Any]]:
-        """Get distribution of tickets across different sources."""
-        return await analytics_crud.get_ticket_sources(
-            self.db,
-            organization_id=organization_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
     async def store_ticket_analytics(
         self,
         ticket_id: UUID,
@@ -202,14 +112,11 @@ class AnalyticsService:
                 data=analytics_data
             )
 
-            # Invalidate relevant cache entries
+            # Retire every cached range for the organization at once;
+            # the old entries expire on their TTL
             ticket = await self.db.get(Ticket, ticket_id)
             if ticket:
-                cache_key = (
-                    f"{self.cache_prefix}org:{ticket.organization_id}:"
-                    f"{datetime.utcnow().date()}"
-                )
-                await Cache.delete(cache_key)
+                await Cache.incr(cache_generation_key(ticket.organization_id))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -222,10 +129,23 @@ class AnalyticsService:
         days: int = 7
     ) -> List[Dict[str, Any]]:
         """Get trending issues based on recent tickets."""
-        cache_key = f"{self.cache_prefix}trending:{organization_id}:{days}"
+        return orjson.loads(
+            await self.get_trending_issues_json(organization_id, days)
+        )
+
+    async def get_trending_issues_json(
+        self,
+        organization_id: UUID,
+        days: int = 7
+    ) -> bytes:
+        """Get trending issues as serialized JSON, cached as response bytes."""
+        generation = await self._cache_generation(organization_id)
+        cache_key = (
+            f"{self.cache_prefix}trending:{organization_id}:{generation}:{days}"
+        )
 
         # Try cache first
-        cached_trends = await Cache.get(cache_key)
+        cached_trends = await Cache.get_bytes(cache_key)
         if cached_trends:
             return cached_trends
 
@@ -236,11 +156,34 @@ class AnalyticsService:
                 days=days
             )
 
-            # Cache the results
-            await Cache.set(cache_key, trends, expire=self.cache_ttl)
-            return trends
+            # Cache the serialized results
+            payload = format_json_bytes(trends)
+            await Cache.set_bytes(cache_key, payload, expire=self.cache_ttl)
+            return payload
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to get trending issues: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def stream_daily_metrics_json(
+        self,
+        organization_id: UUID,
+        start_date: date,
+        end_date: date
+    ) -> AsyncIterator[bytes]:
+        """Yield daily analytics rows as one JSON array, a batch per chunk."""
+        yield b"["
+        separator = b""
+        async for rows in analytics_crud.stream_metrics_in_date_range(
+            self.db,
+            organization_id=organization_id,
+            start_date=start_date,
+            end_date=end_date
+        ):
+            # Drop the batch's own brackets so batches join into one array
+            chunk = format_json_bytes([dict(row) for row in rows])[1:-1]
+            if chunk:
+                yield separator + chunk
+                separator = b","
+        yield b"]"
@@ -7,6 +7,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.config import settings
 from app.core.redis import Cache
@@ -15,6 +16,7 @@ from app.services.ticket_service import TicketService
 
 class EmailService:
     def __init__(self, db: Any):
+        self.db = db
         self.smtp_config = {
             "hostname": settings.SMTP_HOST,
             "port": settings.SMTP_PORT,
@@ -94,43 +96,50 @@ class EmailService:
 
         return await self.send_email(to_email, subject, body)
 
+    def _fetch_unseen_messages(self) -> List[email.message.Message]:
+        """Download unread messages and mark them read (blocking IMAP session)."""
+        # Connect to IMAP server
+        mail = imaplib.IMAP4_SSL(
+            self.imap_config["host"],
+            self.imap_config["port"]
+        )
+        mail.login(
+            self.imap_config["username"],
+            self.imap_config["password"]
+        )
+
+        # Select inbox
+        mail.select("INBOX")
+
+        # Search for unread emails
+        _, message_numbers = mail.search(None, "UNSEEN")
+
+        messages = []
+        for num in message_numbers[0].split():
+            # Fetch email message
+            _, msg_data = mail.fetch(num, "(RFC822)")
+            messages.append(email.message_from_bytes(msg_data[0][1]))
+
+            # Mark as read
+            mail.store(num, "+FLAGS", "\\Seen")
+
+        mail.close()
+        mail.logout()
+        return messages
+
     async def poll_emails(self) -> List[Dict[str, Any]]:
         """Poll for new emails and create tickets."""
         try:
-            # Connect to IMAP server
-            mail = imaplib.IMAP4_SSL(
-                self.imap_config["host"],
-                self.imap_config["port"]
-            )
-            mail.login(
-                self.imap_config["username"],
-                self.imap_config["password"]
-            )
-
-            # Select inbox
-            mail.select("INBOX")
-
-            # Search for unread emails
-            _, message_numbers = mail.search(None, "UNSEEN")
+            # imaplib is synchronous; keep the session off the event loop
+            messages = await run_in_threadpool(self._fetch_unseen_messages)
 
             new_tickets = []
-            for num in message_numbers[0].split():
-                # Fetch email message
-                _, msg_data = mail.fetch(num, "(RFC822)")
-                email_body = msg_data[0][1]
-                email_message = email.message_from_bytes(email_body)
-
+            for email_message in messages:
                 # Process email
                 ticket_data = await self._process_email(email_message)
                 if ticket_data:
                     new_tickets.append(ticket_data)
 
-                # Mark as read
-                mail.store(num, "+FLAGS", "\\Seen")
-
-            mail.close()
-            mail.logout()
-
             return new_tickets
         except Exception as e:
             raise HTTPException(
@@ -158,26 +167,34 @@ class EmailService:
             else:
                 body = email_message.get_payload(decode=True).decode()
 
-            # Create ticket
-            ticket_service = TicketService()
-            ticket = await ticket_service.create_ticket({
-                "title": subject,
-                "description": body,
-                "source": "email",
-                "customer_email": from_email
-            })
-
-            return {
-                "ticket_id": ticket.id,
-                "from_email": from_email,
-                "subject": subject,
-                "status": "created"
-            }
+            return await self.create_ticket_from_email(from_email, subject, body)
         except Exception as e:
             # Log error but don't fail entire polling process
             print(f"Error processing email: {str(e)}")
             return None
 
+    async def create_ticket_from_email(
+        self,
+        from_email: str,
+        subject: str,
+        body: str
+    ) -> Dict[str, Any]:
+        """Create a ticket for an inbound email."""
+        ticket_service = TicketService(self.db)
+        ticket = await ticket_service.create_ticket({
+            "title": subject,
+            "description": body,
+            "source": "email",
+            "customer_email": from_email
+        })
+
+        return {
+            "ticket_id": ticket.id,
+            "from_email": from_email,
+            "subject": subject,
+            "status": "created"
+        }
+
     async def send_ticket_response(
         self,
         ticket_id: UUID,
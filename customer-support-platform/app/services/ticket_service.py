@@ -5,6 +5,7 @@ from uuid import UUID
 
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from sqlalchemy import select
@@ -27,16 +28,39 @@ from app.api.websockets import notify_ticket_created
 from app.core.config import settings
 from app.utils.validators import validate_ticket_limit
 from app.core.message_queue import MessageQueue
-from app.core.cache import Cache
+from app.core.redis import Cache
+from app.services import analytics_buffer
+from app.services.analytics_service import cache_generation_key
 from app.core.message_handler import message_queue_handler
 from app.ai.crews import CrewFactory
 from app.ai.vector_db import vector_db
 from app.api.websockets import notify_ticket_updated, notify_message_added
 from app.tasks.notification_tasks import send_notification_task
+from app.utils.enums import TicketCriticality
 
 
 logger = get_logger(__name__)
 
+# Validates raw ticket dicts from Telegram/email ingest; built once at import
+_ticket_create_adapter = TypeAdapter(TicketCreate)
+
+
+async def _record_analytics(organization_id: UUID, **kwargs) -> None:
+    """
+    Record analytics deltas; failures are logged, never raised to the caller.
+
+    Deltas are buffered where the web app's flusher runs and written
+    straight through in Celery tasks and queue consumers.
+    """
+    try:
+        if analytics_buffer.is_buffering():
+            analytics_buffer.record(organization_id, **kwargs)
+        else:
+            await analytics_buffer.record_now(organization_id, **kwargs)
+    except Exception as e:
+        logger.error(f"Analytics buffering failed for organization {organization_id}: {e}")
+
+
 class TicketService:
     """Service for ticket management operations."""
 
@@ -60,7 +84,7 @@ class TicketService:
             # Accept raw dicts coming from external services (e.g. Telegram)
             if not isinstance(ticket_data, TicketCreate):
                 try:
-                    ticket_data = TicketCreate(**ticket_data)  # type: ignore[arg-type]
+                    ticket_data = _ticket_create_adapter.validate_python(ticket_data)
                 except Exception as exc:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
@@ -157,8 +181,19 @@ class TicketService:
             )
         )
 
+        # Enum members, values and upper-case names all map to one counter
+        criticality = TicketCriticality(
+            getattr(classification.criticality, "value", classification.criticality).lower()
+        )
+        await _record_analytics(
+            ticket.organization_id,
+            category_id=classification.category_id,
+            total_tickets=1,
+            **{f"crit_{criticality.value}": 1}
+        )
+
         # Queue for resolution if low criticality
-        if classification.criticality == "low":
+        if criticality is TicketCriticality.LOW:
             await self._queue_for_auto_resolution(ticket_id)
         else:
             await self._assign_to_agent(ticket_id)
@@ -244,98 +279,39 @@ class TicketService:
         if not ticket:
             raise ValueError(f"Ticket {ticket_id} not found")
 
-        # Retrieve all active agents for the organization
-        agents = await user_crud.get_multi_active_agents(
+        # Rotation comes from the Redis-cached agent list, not Postgres
+        agent_id = await user_crud.next_active_agent_id(
             self.db,
-            organization_id=ticket.organization_id
+            organization_id=ticket.organization_id,
+            category_id=ticket.category_id
         )
-        if ticket.category_id:
-            agents = [
-                agent for agent in agents 
-                if any(assign.category_id == ticket.category_id 
-                       for assign in getattr(agent, "category_assignments", []))
-            ]
-            
-            if not agents:
-                logger.warning(
-                    f"No agents available for category {ticket.category_id} in ticket {ticket_id}"
-                )
-                return
-
-        if not agents:
+        if agent_id is None:
             logger.warning("No available active agents for ticket %s", ticket_id)
             return
 
-        # Select agent with fewest active tickets; tiebreaker -> earliest last_assigned_at
-        selected_agent = None
-        min_tickets = float("inf")
-        earliest_last_assigned: Optional[datetime] = None
-
-        for agent in agents:
-            active_cnt = await self.get_agent_active_tickets_count(agent.id)
-            last_assigned = agent.last_assigned_at or datetime.min
-
-            if (active_cnt < min_tickets or
-                (active_cnt == min_tickets and (
-                    earliest_last_assigned is None or last_assigned < earliest_last_assigned))):
-                selected_agent = agent
-                min_tickets = active_cnt
-                earliest_last_assigned = last_assigned
-
-        if not selected_agent:
-            logger.warning("Agent selection failed for ticket %s", ticket_id)
-            return
-
         # Update ticket in DB
         await self.update_ticket(
             ticket_id,
             TicketUpdate(
-                assigned_agent_id=selected_agent.id,
+                assigned_agent_id=agent_id,
                 status="assigned",
                 assigned_at=datetime.utcnow()
             )
         )
 
         # Stamp agent
-        await user_crud.update(
-            self.db,
-            db_obj=selected_agent,
-            obj_in={"last_assigned_at": datetime.utcnow()}
-        )
+        await user_crud.update_last_assigned(self.db, user_id=agent_id)
 
         # Notify agent asynchronously
         await send_notification_task.delay(
             notification_type="ticket_assigned",
-            recipient_id=str(selected_agent.id),
+            recipient_id=str(agent_id),
             data={
                 "ticket_id": str(ticket_id),
                 "ticket_title": getattr(ticket, "subject", getattr(ticket, "title", ""))
             }
         )
-        """Assign ticket to an available agent using round-robin."""
-        ticket = await self.get_ticket(ticket_id)
-        if not ticket:
-            raise ValueError(f"Ticket {ticket_id} not found")
-
-        # Get available agents (status='active')
-        agents = await user_crud.get_multi_active_agents(
-            self.db,
-            organization_id=ticket.organization_id
-        )
-        # Filter agents with status='active' if not already filtered
-        agents = [a for a in agents if getattr(a, 'status', 'active') == 'active']
-
-        if not agents:
-            logger.warning(f"No available active agents for ticket {ticket_id}")
-            return
-        
-        # Select agent using round-robin
-        selected_agent = None
-        min_tickets = float('inf')
-        min_last_assigned = None
-        
 
-        
     async def get_agent_active_tickets_count(self, agent_id: UUID) -> int:
         """Return count of active (unresolved) tickets assigned to the agent."""
         from app.models.tickets import Ticket as TicketModel
@@ -359,7 +335,7 @@ class TicketService:
             return TicketResponse(**cached_ticket)
 
         # Cache miss, get from database
-        ticket = await ticket_crud.get(self.db, id=ticket_id)
+        ticket = await ticket_crud.get_with_relations(self.db, id=ticket_id)
         if not ticket:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -421,9 +397,15 @@ class TicketService:
                 obj_in=ticket_data
             )
             
-            # Invalidate cache
-            cache_key = f"{self.cache_prefix}{str(ticket_id)}"
-            await Cache.delete(cache_key)
+            # Invalidate the ticket and its organization's analytics
+            # in one round-trip
+            try:
+                async with Cache.pipeline() as pipe:
+                    pipe.delete(f"{self.cache_prefix}{str(ticket_id)}")
+                    pipe.incr(cache_generation_key(updated_ticket.organization_id))
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Cache invalidation failed for ticket {ticket_id}: {e}")
             
             # Send WebSocket notification
             await notify_ticket_updated(
@@ -450,6 +432,13 @@ class TicketService:
                 )
             )
 
+            await _record_analytics(
+                ticket.organization_id,
+                category_id=ticket.category_id,
+                agent_id=ticket.assigned_agent_id,
+                resolved_tickets=1
+            )
+
             # Queue for analysis
             await self._queue_for_analysis(ticket_id)
             return ticket
@@ -507,8 +496,7 @@ class TicketService:
                 self.db,
                 obj_in=message_data,
                 ticket_id=str(ticket_id),
-                sender_id=str(sender_id),
-                organization_id=str(ticket.organization_id)
+                sender_id=str(sender_id)
             )
             
             # Send WebSocket notification
@@ -139,7 +139,7 @@ class UserService:
         )
         user = await user_crud.create(self.db, obj_in=user_in_db)
         
-        return UserResponse.model_validate(user)
+        return UserResponse.from_row(user)
 
     async def get_user(self, user_id: UUID) -> Optional[UserResponse]:
         """Get user by ID with caching."""
@@ -154,10 +154,10 @@ class UserService:
             return None
 
         # Cache the result
-        user_data = UserResponse.model_validate(user).model_dump()
-        await self._set_cache(f"user:{user_id}", user_data)
+        response = UserResponse.from_row(user)
+        await self._set_cache(f"user:{user_id}", response.model_dump())
         
-        return UserResponse.model_validate(user)
+        return response
 
     async def get_by_email(self, email: str) -> Optional[UserResponse]:
         """Get user by email with caching."""
@@ -172,10 +172,10 @@ class UserService:
             return None
 
         # Cache the result
-        user_data = UserResponse.model_validate(user).model_dump()
-        await self._set_cache(f"user:email:{email}", user_data)
+        response = UserResponse.from_row(user)
+        await self._set_cache(f"user:email:{email}", response.model_dump())
         
-        return UserResponse.model_validate(user)
+        return response
 
     async def update_user(
         self,
@@ -226,7 +226,7 @@ class UserService:
         # Invalidate cache
         await self._invalidate_cache(user_id)
         
-        return UserResponse.model_validate(updated_user)
+        return UserResponse.from_row(updated_user)
 
     async def delete_user(self, user_id: UUID) -> bool:
         """Delete user with cache invalidation."""
@@ -277,7 +277,7 @@ class UserService:
         # Invalidate cache
         await self._invalidate_cache(user_id)
         
-        return UserResponse.model_validate(updated_user)
+        return UserResponse.from_row(updated_user)
 
     async def list_users(
         self,
@@ -294,4 +294,4 @@ class UserService:
             skip=skip,
             limit=limit
         )
-        return [UserResponse.model_validate(user) for user in users]
+        return [UserResponse.from_row(user) for user in users]
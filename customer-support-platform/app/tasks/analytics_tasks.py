@@ -2,6 +2,7 @@
 from celery import shared_task
 from app.services.analytics_service import AnalyticsService
 from app.models.analytics import TicketAnalytics
+from app.crud.analytics import analytics as analytics_crud
 
 @celery_app.task
 async def summarize_ticket_task(ticket_id: str):
@@ -53,4 +54,28 @@ async def generate_daily_report_task():
     """Generate daily analytics report."""
     async with AsyncSession() as db:
         service = AnalyticsService(db)
-        await service.generate_daily_report()
\ No newline at end of file
+        await service.generate_daily_report()
+
+
+@shared_task(
+    name="analytics.refresh_daily_view",
+    queue="analytics",
+    soft_time_limit=1800,  # 30 minute timeout
+    time_limit=1800
+)
+async def refresh_ticket_analytics_daily_task():
+    """Refresh the ticket_analytics_daily materialized view."""
+    async with AsyncSession() as db:
+        await analytics_crud.refresh_daily_view(db)
+
+
+@shared_task(
+    name="analytics.recount_org_tickets",
+    queue="analytics",
+    soft_time_limit=1800,  # 30 minute timeout
+    time_limit=1800
+)
+async def recount_org_tickets_task():
+    """Recompute organization ticket counters to correct any drift."""
+    async with AsyncSession() as db:
+        await analytics_crud.recount_organization_tickets(db)
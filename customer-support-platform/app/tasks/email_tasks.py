@@ -1,6 +1,8 @@
 """Email polling and notification tasks."""
+from typing import Any, Dict, Optional
 from celery import shared_task
 from app.services.email_service import EmailService
+from app.integrations.email_client import email_client
 from app.core.database import AsyncSession
 from app.core.logging import logger
 
@@ -39,4 +41,30 @@ async def send_welcome_email_task(user_id: str):
     """Send welcome email to new user."""
     async with AsyncSession() as db:
         service = EmailService(db)
-        await service.send_welcome_email(user_id)
\ No newline at end of file
+        await service.send_welcome_email(user_id)
+
+@shared_task(
+    name="email.fetch_body",
+    queue="polling",
+    retry_backoff=True,
+    max_retries=3
+)
+async def fetch_email_body_task(
+    uid: str,
+    folder: str = "INBOX",
+    headers: Optional[Dict[str, Any]] = None
+):
+    """Fetch a polled email's body by IMAP UID and open a ticket for it."""
+    headers = headers or {}
+    message = await email_client.fetch_email_body(uid, folder)
+    try:
+        async with AsyncSession() as db:
+            service = EmailService(db)
+            return await service.create_ticket_from_email(
+                from_email=headers.get('from'),
+                subject=headers.get('subject'),
+                body=message['body']
+            )
+    finally:
+        # Tickets have no attachment storage; drop the temp files either way
+        email_client.discard_attachments(message['attachments'])
@@ -1,5 +1,6 @@
 """Telegram bot polling and notification tasks."""
 from celery import shared_task
+from app.config import settings
 from app.services.telegram_service import TelegramService
 from app.core.database import AsyncSession
 
@@ -12,6 +13,8 @@ from app.core.database import AsyncSession
 )
 async def poll_telegram_updates_task():
     """Poll telegram for new messages/tickets."""
+    if settings.TELEGRAM_POLLER != "beat":
+        return
     async with AsyncSession() as db:
         service = TelegramService(db)
         await service.poll_updates()
@@ -1,5 +1,6 @@
+from contextvars import ContextVar
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional
 import json
 
 from app.core.redis import get_redis
@@ -58,6 +59,40 @@ def invalidate_cache(prefix: str, *patterns: str):
     return decorator
 
 
+# Per-request memo of DB lookups; set to a fresh dict for each request by
+# RequestIDMiddleware and left as None outside of a request
+request_cache_ctx_var: ContextVar[Optional[Dict[Any, Any]]] = ContextVar(
+    'request_cache', default=None
+)
+
+
+def request_cached(func: Callable) -> Callable:
+    """
+    Decorator to memoize an async CRUD lookup for the rest of the request.
+
+    The session argument is left out of the key, so repeated lookups with
+    the same arguments in one request return the first result.
+    """
+    @wraps(func)
+    async def wrapper(self, db, *args, **kwargs) -> Any:
+        cache = request_cache_ctx_var.get()
+        if cache is None:
+            return await func(self, db, *args, **kwargs)
+
+        key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = await func(self, db, *args, **kwargs)
+        return cache[key]
+    return wrapper
+
+
+def clear_request_cache() -> None:
+    """Drop memoized lookups for the current request after a write."""
+    cache = request_cache_ctx_var.get()
+    if cache is not None:
+        cache.clear()
+
+
 # Predefined cache decorators
 cache_user = cache_result("user", USER_CACHE_TIMEOUT)
 cache_ticket = cache_result("ticket", TICKET_CACHE_TIMEOUT)
@@ -3,6 +3,13 @@ USER_CACHE_TIMEOUT = 3600  # 1 hour
 TICKET_CACHE_TIMEOUT = 1800  # 30 minutes
 CATEGORY_CACHE_TIMEOUT = 7200  # 2 hours
 DOCUMENT_CACHE_TIMEOUT = 3600  # 1 hour
+ACTIVE_AGENTS_CACHE_TIMEOUT = 15  # seconds; agent rotation changes quickly
+ACTIVE_AGENTS_RR_TIMEOUT = 24 * 60 * 60  # seconds; idle rotation pointers expire
+# Counters are kept current by increments, but a seed can miss a write that
+# raced the SQL aggregate and bulk/cascade deletes bypass the CRUD, so the
+# seeded value is only trusted briefly
+ORG_TOTALS_CACHE_TIMEOUT = 300  # 5 minutes
+EMAIL_UID_CLAIM_TIMEOUT = 3600  # 1 hour; covers the body task's retries
 
 # Rate limits
 API_RATE_LIMIT = 100  # requests per minute
@@ -37,6 +44,12 @@ TICKET_CACHE_PREFIX = "ticket:"
 CATEGORY_CACHE_PREFIX = "category:"
 DOCUMENT_CACHE_PREFIX = "document:"
 TOKEN_CACHE_PREFIX = "token:"
+ACTIVE_AGENTS_CACHE_PREFIX = "active_agents:"
+ORG_TOTALS_CACHE_PREFIX = "org:"
+EMAIL_UID_CLAIM_PREFIX = "email:uid:"
+
+# Pub/sub channels
+ROLE_INVALIDATION_CHANNEL = "rbac:invalidate"
 
 # MinIO bucket names
 DOCUMENT_BUCKET = "documents"
@@ -2,6 +2,8 @@ from enum import Enum
 
 class TicketStatus(str, Enum):
     NEW = "new"
+    OPEN = "open"
+    PENDING = "pending"
     ASSIGNED = "assigned"
     IN_PROGRESS = "in_progress"
     RESOLVED = "resolved"
@@ -15,7 +17,9 @@ class TicketSource(str, Enum):
 
 class TicketCriticality(str, Enum):
     LOW = "low"
+    MEDIUM = "medium"
     HIGH = "high"
+    CRITICAL = "critical"
 
 class UserRole(str, Enum):
     ADMIN = "admin"
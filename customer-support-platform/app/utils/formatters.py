@@ -1,5 +1,7 @@
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
+from decimal import Decimal
+import orjson
 
 from app.utils.enums import TicketStatus, TicketCriticality
 
@@ -66,4 +68,20 @@ def format_file_size(size: int) -> str:
         if size < 1024:
             return f"{size:.1f} {unit}"
         size /= 1024
-    return f"{size:.1f} TB"
\ No newline at end of file
+    return f"{size:.1f} TB"
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the types orjson does not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def format_json_bytes(data: Any) -> bytes:
+    """Serialize a response payload to JSON bytes with orjson."""
+    return orjson.dumps(
+        data,
+        default=_json_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+    )
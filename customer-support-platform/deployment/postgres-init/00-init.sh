@@ -13,6 +13,7 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
     
     -- Grant privileges to the application user on the customer_support database
     \c customer_support
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
     GRANT ALL ON SCHEMA public TO app_user;
     GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO app_user;
     GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO app_user;
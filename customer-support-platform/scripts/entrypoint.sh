@@ -7,7 +7,16 @@ if [ "$SERVICE" = "worker" ]; then
 elif [ "$SERVICE" = "beat" ]; then
     echo "Starting Celery beat..."
     exec celery -A app.worker:celery_app beat --loglevel=info
+elif [ "$SERVICE" = "consumer" ]; then
+    echo "Starting ticket queue consumer..."
+    exec python -m app.core.message_handler
 else
     echo "Starting FastAPI app..."
-    exec uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000} --reload
+    # uvicorn ignores --workers under --reload, so reload is a dev-only opt-in
+    if [ "$RELOAD" = "true" ]; then
+        SERVER_MODE="--reload"
+    else
+        SERVER_MODE="--workers ${WORKERS_COUNT:-$((2 * $(nproc) + 1))}"
+    fi
+    exec uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000} --loop uvloop --http httptools $SERVER_MODE
 fi